@@ -0,0 +1,106 @@
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from notation import parse_position
+from player import MinimaxPlayer
+from transposition import TranspositionTable
+
+def analyse(board, side, depth, table=None):
+    """
+    Scores a position for the side to move. At depth 0 this is the heuristic player's score of
+    the workers as they stand (3 x height + 2 x center + distance); deeper, it is a MinimaxPlayer
+    search to that many full turns. Returns (score, best turn or None).
+    """
+    workers = board.sides[side]
+    if any(board.get_worker_height(w) == 3 for w in board.sides[1 - side]):
+        # the game is already over
+        return -MinimaxPlayer.WIN_SCORE, None
+    if not any(board.is_possible_next_turn(w) for w in workers):
+        return -MinimaxPlayer.WIN_SCORE, None
+    if depth == 0:
+        height, center, distance = board.evaluate(workers)
+        return 3*height + 2*center + distance, None
+    player = MinimaxPlayer(side, board, time_limit=float('inf'), max_depth=depth, table=table, processes=1)
+    _, score, action = player.search_scores()[-1]
+    return score, action
+
+def analyse_chunk(args):
+    """
+    Runs in a worker process: analyses a chunk of (line number, position) pairs and returns the
+    output lines. A line that is not a position gets an error result instead.
+    """
+    depth, chunk = args
+    table = TranspositionTable() if depth > 0 else None
+    output = []
+    for number, text in chunk:
+        try:
+            board, side = parse_position(text)
+        except ValueError as error:
+            output.append(f"{number}\t{text}\terror: {error}")
+            continue
+        score, action = analyse(board, side, depth, table)
+        output.append(f"{number}\t{text}\t{score}\t{','.join(action) if action else '-'}")
+    return output
+
+def read_chunks(lines, size):
+    """
+    Yields chunks of at most size (line number, position) pairs, skipping blank lines
+    """
+    numbered = ((number, line.strip()) for number, line in enumerate(lines, 1))
+    positions = ((number, text) for number, text in numbered if text)
+    while True:
+        chunk = list(itertools.islice(positions, size))
+        if not chunk:
+            return
+        yield chunk
+
+def analyse_stream(lines, out, depth=0, processes=None, chunk_size=256):
+    """
+    Analyses positions read lazily from lines and writes each chunk's results to out as soon
+    as it is done, so results come out of order. At most two chunks per process are read ahead,
+    so memory stays bounded however many positions there are. Returns the number of lines written.
+    """
+    chunks = read_chunks(lines, chunk_size)
+    written = 0
+
+    def write(output):
+        out.write("\n".join(output) + "\n")
+        out.flush()
+        return len(output)
+
+    if processes is None:
+        processes = os.cpu_count()
+    if processes == 1:
+        for chunk in chunks:
+            written += write(analyse_chunk((depth, chunk)))
+        return written
+    with ProcessPoolExecutor(processes) as executor:
+        pending = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * processes:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    written += write(future.result())
+            pending.add(executor.submit(analyse_chunk, (depth, chunk)))
+        for future in pending:
+            written += write(future.result())
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scores positions in position notation, one per line, as they stream in")
+    parser.add_argument('path', nargs='?', default='-', help="file of positions, or - for stdin")
+    parser.add_argument('--depth', type=int, default=0, help="search depth in full turns, 0 for the heuristic score")
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=256, help="positions per task")
+    args = parser.parse_args(argv)
+
+    if args.path == '-':
+        analyse_stream(sys.stdin, sys.stdout, args.depth, args.processes, args.chunk)
+    else:
+        with open(args.path) as lines:
+            analyse_stream(lines, sys.stdout, args.depth, args.processes, args.chunk)
+
+if __name__ == "__main__":
+    main()
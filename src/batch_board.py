@@ -0,0 +1,145 @@
+import numpy as np
+from board import SantoriniBoard, DIRECTIONS, NEIGHBOURS, DISTANCE, CENTER_WEIGHT, SIDES
+
+WORKERS = SIDES[0] + SIDES[1]
+DIRECTION_NAMES = list(DIRECTIONS)
+
+# TARGET[square, direction] is the square a step away, or -1 off the board
+TARGET = np.full((25, len(DIRECTION_NAMES)), -1, dtype=np.int64)
+for _square, _pairs in enumerate(NEIGHBOURS):
+    for _direction, _target in _pairs:
+        TARGET[_square, DIRECTION_NAMES.index(_direction)] = _target
+DISTANCE_TABLE = np.array(DISTANCE, dtype=np.int64)
+CENTER_TABLE = np.array(CENTER_WEIGHT, dtype=np.int64)
+
+class BatchBoard():
+    """
+    Holds N Santorini positions as arrays so legal moves, builds and scores for all of them are
+    computed with whole-array operations. Heights are an N x 5 x 5 array and worker squares an
+    N x 4 array in A, B, Y, Z order. Directions are indices into DIRECTION_NAMES.
+    """
+    def __init__(self, count):
+        start = SantoriniBoard()
+        self._heights = np.zeros((count, 5, 5), dtype=np.int64)
+        squares = start.get_worker_squares()
+        self._workers = np.tile(np.array([squares[w] for w in WORKERS], dtype=np.int64), (count, 1))
+
+    @classmethod
+    def from_boards(cls, boards):
+        """
+        Packs a list of SantoriniBoard positions into a batch
+        """
+        batch = cls(len(boards))
+        batch._heights[:] = np.array([b.get_heights() for b in boards]).reshape(len(boards), 5, 5)
+        batch._workers[:] = [[b.get_worker_squares()[w] for w in WORKERS] for b in boards]
+        return batch
+
+    def to_board(self, index):
+        """
+        Unpacks one position of the batch into a SantoriniBoard
+        """
+        board = SantoriniBoard()
+        board.set_position(self._heights[index].ravel().tolist(),
+                           {w: int(square) for w, square in zip(WORKERS, self._workers[index])})
+        return board
+
+    def __len__(self):
+        return len(self._workers)
+
+    def _get_heights(self):
+        return self._heights
+
+    heights = property(_get_heights)
+
+    def _get_workers(self):
+        return self._workers
+
+    workers = property(_get_workers)
+
+    def _flat_heights(self):
+        return self._heights.reshape(len(self), 25)
+
+    def _worker_index(self, w):
+        return WORKERS.index(w) if isinstance(w, str) else w
+
+    def _free(self, targets, ignore=None):
+        """
+        Returns which target squares (N x k) are on the board, not occupied by a worker and not
+        domed. A worker column given as ignore does not count as occupying its square.
+        """
+        on_board = targets >= 0
+        safe = np.where(on_board, targets, 0)
+        workers = self._workers if ignore is None else np.delete(self._workers, ignore, axis=1)
+        occupied = (safe[:, :, None] == workers[:, None, :]).any(axis=2)
+        heights = np.take_along_axis(self._flat_heights(), safe, axis=1)
+        return on_board & ~occupied & (heights < 4), heights
+
+    def move_mask(self, w):
+        """
+        Returns an N x 8 boolean array of the valid move directions for a worker
+        """
+        squares = self._workers[:, self._worker_index(w)]
+        free, heights = self._free(TARGET[squares])
+        current = self._flat_heights()[np.arange(len(self)), squares]
+        return free & (heights - current[:, None] <= 1)
+
+    def build_mask(self, w):
+        """
+        Returns an N x 8 boolean array of the valid build directions for a worker
+        """
+        free, _ = self._free(TARGET[self._workers[:, self._worker_index(w)]])
+        return free
+
+    def action_mask(self, side):
+        """
+        Returns an N x 2 x 8 x 8 boolean array of the legal full turns (worker of the side, move
+        direction, build direction). The square the worker leaves counts as free to build on.
+        """
+        mask = np.zeros((len(self), 2, 8, 8), dtype=bool)
+        for i, w in enumerate(SIDES[side]):
+            index = WORKERS.index(w)
+            moves = self.move_mask(index)
+            destinations = np.where(moves, TARGET[self._workers[:, index]], 0)
+            free, _ = self._free(TARGET[destinations].reshape(len(self), 64), ignore=index)
+            mask[:, i] = moves[:, :, None] & free.reshape(len(self), 8, 8)
+        return mask
+
+    def apply_action(self, w, move_dir, build_dir, active=None):
+        """
+        Plays a full turn in every game. w, move_dir and build_dir are scalars or length-N arrays
+        of worker indices (or a worker letter) and direction indices. Games where active is False
+        are left alone, and the actions are assumed legal.
+        """
+        games = np.arange(len(self))
+        w = np.broadcast_to(np.asarray(self._worker_index(w)), (len(self),))
+        move_dir = np.broadcast_to(move_dir, (len(self),))
+        build_dir = np.broadcast_to(build_dir, (len(self),))
+        if active is not None:
+            games, w, move_dir, build_dir = games[active], w[active], move_dir[active], build_dir[active]
+        destinations = TARGET[self._workers[games, w], move_dir]
+        self._workers[games, w] = destinations
+        np.add.at(self._flat_heights(), (games, TARGET[destinations, build_dir]), 1)
+
+    def _side_squares(self, workers):
+        return self._workers[:, [WORKERS.index(w) for w in workers]]
+
+    def height_score(self, workers):
+        """
+        Returns the height score of the given workers in every game
+        """
+        return np.take_along_axis(self._flat_heights(), self._side_squares(workers), axis=1).sum(axis=1)
+
+    def center_score(self, workers):
+        """
+        Returns the center score of the given workers in every game
+        """
+        return CENTER_TABLE[self._side_squares(workers)].sum(axis=1)
+
+    def distance_score(self, workers):
+        """
+        Returns the distance score of the given workers in every game
+        """
+        opponents = SIDES[1] if list(workers) == SIDES[0] else SIDES[0]
+        own = self._side_squares(workers)
+        distances = DISTANCE_TABLE[self._side_squares(opponents)[:, :, None], own[:, None, :]]
+        return 8 - distances.min(axis=2).sum(axis=1)
@@ -0,0 +1,157 @@
+import random
+import sys
+import time
+import timeit
+from board import SantoriniBoard
+from tile_board import DIRECTIONS, TileGridBoard
+
+def sample_positions(count, seed=0, size=5, workers_per_side=2):
+    """
+    Plays random games and collects (board, worker) pairs from the middle of them
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = SantoriniBoard(size, size, workers_per_side)
+        sides = board.sides
+        for turn in range(rng.randint(0, 20)):
+            workers = [w for w in sides[turn % 2] if board.is_possible_next_turn(w)]
+            if not workers:
+                break
+            w = rng.choice(workers)
+            board.move(w, rng.choice(board.move_list(w)))
+            board.build(w, rng.choice(board.build_list(w)))
+        positions.append((board, rng.choice(sides[0] + sides[1])))
+    return positions
+
+def bench_generation(count=200, repeat=5):
+    """
+    Times the move and build generation functions over a fixed set of positions, on
+    SantoriniBoard and on the tile-grid reference, and prints both with the speed-up
+    """
+    positions = sample_positions(count)
+    references = [(TileGridBoard(board), w) for board, w in positions]
+    functions = {
+        'move_list': lambda b, w: b.move_list(w),
+        'build_list': lambda b, w: b.build_list(w),
+        'is_possible_next_turn': lambda b, w: b.is_possible_next_turn(w),
+        'valid_move': lambda b, w: [b.valid_move(w, d) for d in DIRECTIONS],
+        'valid_build': lambda b, w: [b.valid_build(w, d) for d in DIRECTIONS],
+    }
+
+    def per_call(function, boards):
+        def run():
+            for board, w in boards:
+                function(board, w)
+        return min(timeit.repeat(run, number=20, repeat=repeat)) / (20 * count)
+
+    print(f"{'function':24} {'tile grid':>15} {'packed':>15} {'speed-up':>9}")
+    for name, function in functions.items():
+        reference = per_call(function, references)
+        packed = per_call(function, positions)
+        print(f"{name:24} {reference * 1e6:7.2f} us/call {packed * 1e6:7.2f} us/call {reference / packed:8.1f}x")
+
+def bench_batch(count=10000, repeat=3):
+    """
+    Compares legal move generation for every worker of many positions: looping over
+    SantoriniBoard.move_list against one BatchBoard.move_mask call per worker
+    """
+    from batch_board import BatchBoard
+    boards = [board for board, _ in sample_positions(count)]
+    batch = BatchBoard.from_boards(boards)
+    def loop():
+        for board in boards:
+            for w in 'ABYZ':
+                board.move_list(w)
+    def vectorised():
+        for w in 'ABYZ':
+            batch.move_mask(w)
+    for name, run in (('move_list loop', loop), ('BatchBoard.move_mask', vectorised)):
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        print(f"{name:24} {best * 1e3:8.2f} ms for {count} positions")
+
+def bench_parallel(depth=3, positions=4):
+    """
+    Times MinimaxPlayer at a fixed depth with one process and with one process per core
+    """
+    import os
+    from player import MinimaxPlayer
+    processes = os.cpu_count()
+    timings = {}
+    for count in sorted({1, processes}):
+        elapsed = 0.0
+        for board, w in sample_positions(positions, seed=1):
+            player = MinimaxPlayer(0 if w in 'AB' else 1, board, time_limit=1e9, max_depth=depth, processes=count)
+            start = time.perf_counter()
+            player.search()
+            elapsed += time.perf_counter() - start
+            player.close()
+        timings[count] = elapsed
+        print(f"{count:3} processes {elapsed:8.2f} s for {positions} searches at depth {depth}")
+    print(f"speedup {timings[1] / timings[processes]:.2f}x on {processes} processes")
+
+def bench_sizes(sizes=(5, 9, 15), count=200, depth=2, searches=4):
+    """
+    Times move generation, scoring and a fixed-depth MinimaxPlayer search on boards of each
+    size. Their cost depends on the squares around the workers, so it should barely grow with
+    the board.
+    """
+    from player import MinimaxPlayer
+    for size in sizes:
+        positions = sample_positions(count, seed=size, size=size)
+        functions = {
+            'move_list': lambda b, w: b.move_list(w),
+            'build_list': lambda b, w: b.build_list(w),
+            'actions': lambda b, w: list(b.actions(b.sides[0] if w in b.sides[0] else b.sides[1])),
+            'evaluate': lambda b, w: b.evaluate(b.sides[0] if w in b.sides[0] else b.sides[1]),
+        }
+        timings = []
+        for name, function in functions.items():
+            def run():
+                for board, w in positions:
+                    function(board, w)
+            best = min(timeit.repeat(run, number=5, repeat=3))
+            timings.append(f"{name} {best / (5 * count) * 1e6:.2f} us")
+        elapsed = 0.0
+        for board, w in positions[:searches]:
+            player = MinimaxPlayer(0 if w in board.sides[0] else 1, board, time_limit=1e9, max_depth=depth, processes=1)
+            start = time.perf_counter()
+            player.search()
+            elapsed += time.perf_counter() - start
+        timings.append(f"depth {depth} search {elapsed / searches * 1e3:.1f} ms")
+        print(f"{size:2}x{size:<2} " + ", ".join(timings))
+
+def bench_render(games=20):
+    """
+    Plays seeded games into an in-memory stream with each renderer and reports the time and
+    bytes written per turn
+    """
+    import io
+    from game import Game
+    from renderer import TextRenderer, AnsiRenderer
+    for name, renderer_type in (('TextRenderer', TextRenderer), ('AnsiRenderer', AnsiRenderer)):
+        stream = io.StringIO()
+        renderer = renderer_type(stream)
+        turns = 0
+        start = time.perf_counter()
+        for seed in range(games):
+            game = Game('random', 'random', False, False, seed=seed, renderer=renderer)
+            game.play_game()
+            turns += game.turn_num
+        elapsed = time.perf_counter() - start
+        renderer.close()
+        print(f"{name:24} {elapsed / turns * 1e6:8.2f} us/turn {len(stream.getvalue()) / turns:8.1f} bytes/turn")
+
+benchmarks = {
+    'generation': bench_generation,
+    'batch': bench_batch,
+    'parallel': bench_parallel,
+    'sizes': bench_sizes,
+    'render': bench_render,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(benchmarks)
+    for name in names:
+        print(f"== {name}")
+        benchmarks[name]()
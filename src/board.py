@@ -1,96 +1,286 @@
-from tile import SantoriniTile
+import collections
+import functools
+import random
+from renderer import frame
+
+DIRECTIONS = {"n" : (-1, 0), "ne" : (-1, 1), "e" : (0, 1), "se" : (1, 1), "s" : (1, 0), "sw" : (1, -1), "w" : (0, -1), "nw" : (-1, -1)}
+
+def _neighbour_table(rows, cols):
+    """
+    Lists the in-bounds (direction, target square) pairs for every square of a rows x cols board
+    """
+    table = []
+    for square in range(rows * cols):
+        row, col = divmod(square, cols)
+        pairs = []
+        for direction, (d_row, d_col) in DIRECTIONS.items():
+            if 0 <= row + d_row < rows and 0 <= col + d_col < cols:
+                pairs.append((direction, (row + d_row) * cols + col + d_col))
+        table.append(tuple(pairs))
+    return tuple(table)
+
+def worker_sides(workers_per_side):
+    """
+    Names the workers of each side: white counts up from A and blue counts down to Z, so two
+    workers per side are A, B and Y, Z
+    """
+    if not 1 <= workers_per_side <= 13:
+        raise ValueError("each side needs between 1 and 13 workers")
+    return ([chr(ord('A') + i) for i in range(workers_per_side)],
+            [chr(ord('Z') - workers_per_side + 1 + i) for i in range(workers_per_side)])
+
+WORKER_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+BoardTables = collections.namedtuple('BoardTables', [
+    'neighbours', 'targets', 'distance', 'center_weight', 'zobrist_height', 'zobrist_worker', 'zobrist_side'])
+
+@functools.lru_cache(maxsize=None)
+def board_tables(rows, cols):
+    """
+    Builds the lookup tables for a rows x cols board once per size:
+    - neighbours[square]: the (direction, target) pairs and targets[square], a direction to target dict
+    - distance[s1][s2]: the Chebyshev distance between two squares
+    - center_weight[square]: the center score of a worker there, from (min(rows, cols) - 1) // 2 on
+      the middle square(s) down by one per ring to 0 on the outermost rings
+    - zobrist_height[square][height], zobrist_worker[w][square] and zobrist_side: random 64-bit
+      keys. The generator is seeded so keys, and anything stored by them, are the same in every
+      process.
+    """
+    squares = rows * cols
+    neighbours = _neighbour_table(rows, cols)
+    targets = tuple(dict(pairs) for pairs in neighbours)
+    distance = tuple(tuple(max(abs(s1 // cols - s2 // cols), abs(s1 % cols - s2 % cols)) for s2 in range(squares))
+                     for s1 in range(squares))
+    top = (min(rows, cols) - 1) // 2
+    center_weight = tuple(max(0, top - max(abs(2 * (s // cols) - rows + 1) // 2, abs(2 * (s % cols) - cols + 1) // 2))
+                          for s in range(squares))
+    rng = random.Random(327)
+    zobrist_height = tuple(tuple(rng.getrandbits(64) for height in range(5)) for square in range(squares))
+    zobrist_worker = {w: tuple(rng.getrandbits(64) for square in range(squares)) for w in 'ABYZ'}
+    zobrist_side = rng.getrandbits(64)
+    zobrist_worker.update({w: tuple(rng.getrandbits(64) for square in range(squares))
+                           for w in WORKER_LETTERS if w not in zobrist_worker})
+    return BoardTables(neighbours, targets, distance, center_weight, zobrist_height, zobrist_worker, zobrist_side)
+
+# The tables of the standard 5x5 board. NEIGHBOURS[square] is the tuple of (direction, target)
+# pairs and TARGETS[square] maps a direction to its target square. DISTANCE is the Chebyshev
+# distance between every pair of squares and CENTER_WEIGHT the center score of a worker on each
+# square (2 in the middle, 1 on the ring around it, 0 on the edge).
+_standard = board_tables(5, 5)
+NEIGHBOURS = _standard.neighbours
+TARGETS = _standard.targets
+DISTANCE = _standard.distance
+CENTER_WEIGHT = _standard.center_weight
+
+SIDES = worker_sides(2)
+WORKER_SIDE = {w: side for side, workers in enumerate(SIDES) for w in workers}
+
+# Zobrist keys of the standard board: one per (square, height) and per (worker, square), and
+# one for the side to move
+ZOBRIST_HEIGHT = _standard.zobrist_height
+ZOBRIST_WORKER = {w: _standard.zobrist_worker[w] for w in 'ABYZ'}
+ZOBRIST_SIDE = _standard.zobrist_side
 
 class Board():
     """
     This is an abstract class that represents a game board characterized by a grid structure.
+    Boards that keep their own compact representation can skip building a grid of tiles.
     """
-    def __init__(self, rows, cols, tile_type):
+    def __init__(self, rows, cols, tile_type=None):
         self._rows = rows
         self._cols = cols
-        self._grid = [[tile_type(r, c) for c in range(self._cols)] for r in range(self._rows)]
+        if tile_type is not None:
+            self._grid = [[tile_type(r, c) for c in range(self._cols)] for r in range(self._rows)]
 
     def _display(self):
         pass
 
 class SantoriniBoard(Board):
     """
-    Concrete board class that makes a 5x5 board and initializes four pieces (workers) for Santorini
+    Concrete board class that makes a rows x cols board (5x5 by default) and initializes the
+    workers for Santorini, two per side by default. Squares are indexed row * cols + col. Heights
+    are kept in a packed array of ints, the squares holding a worker in an occupancy bitmask and
+    each worker as a square index, so move generation and scoring only look at the squares
+    around the workers whatever the board's size.
     """
-    def __init__(self):
-        super().__init__(5, 5, SantoriniTile)
+    def __init__(self, rows=5, cols=5, workers_per_side=2, position=None):
+        super().__init__(rows, cols)
+        tables = board_tables(rows, cols)
+        self._neighbours = tables.neighbours
+        self._targets = tables.targets
+        self._distance = tables.distance
+        self._center_weight = tables.center_weight
+        self._zobrist_height = tables.zobrist_height
+        self._zobrist_worker = tables.zobrist_worker
+        self._sides = worker_sides(workers_per_side)
+        self._worker_side = {w: side for side, workers in enumerate(self._sides) for w in workers}
+        # the distance score counts down from every opponent being as far away as possible
+        self._max_distance = workers_per_side * (max(rows, cols) - 1)
+
+        # position is (heights, worker squares) to start from instead of the opening layout
+        if position is None:
+            position = ([0] * (rows * cols), self._opening_squares(workers_per_side))
+        self.set_position(*position)
+
+    def _opening_squares(self, workers_per_side):
+        """
+        Places each side's workers in columns spread evenly between the quarter lines, a white
+        and a blue worker in each column on alternating rows. On the 5x5 board this is the spec's
+        A at (3, 1), B at (1, 3), Y at (1, 1) and Z at (3, 3).
+        """
+        near_row = round((self._rows - 1) / 4)
+        far_row = self._rows - 1 - near_row
+        first_col = round((self._cols - 1) / 4)
+        span = self._cols - 1 - 2 * first_col
+        if workers_per_side == 1:
+            cols = [self._cols // 2]
+        else:
+            cols = [first_col + round(i * span / (workers_per_side - 1)) for i in range(workers_per_side)]
+        if len(set(cols)) < workers_per_side or near_row == far_row:
+            raise ValueError(f"a {self._rows}x{self._cols} board has no room for {workers_per_side} workers per side")
+        white, blue = self._sides
+        squares = {}
+        for i, col in enumerate(cols):
+            white_row, blue_row = (far_row, near_row) if i % 2 == 0 else (near_row, far_row)
+            squares[white[i]] = self._square(white_row, col)
+            squares[blue[i]] = self._square(blue_row, col)
+        return squares
+
+    def _get_rows(self):
+        return self._rows
+
+    rows = property(_get_rows)
+
+    def _get_cols(self):
+        return self._cols
+
+    cols = property(_get_cols)
+
+    def _get_sides(self):
+        return self._sides
+
+    sides = property(_get_sides)
+
+    def is_standard(self):
+        """
+        Returns whether this is the 5x5 game with two workers per side that the opening book,
+        tablebase and game record formats are built for
+        """
+        return self._rows == 5 and self._cols == 5 and len(self._sides[0]) == 2
+
+    def set_position(self, heights, worker_squares):
+        """
+        Sets up the board from a list of square heights and a dict mapping workers to squares
+        """
+        self._heights = list(heights)
+        self._occupied = 0
+        self._key = 0
+        for square, height in enumerate(self._heights):
+            self._key ^= self._zobrist_height[square][height]
+        self._worker = {}
+        # per-side sums of worker heights and center weights, kept up to date as workers move
+        self._side_height = [0, 0]
+        self._side_center = [0, 0]
+        for w, square in worker_squares.items():
+            self._place_worker(w, square)
+
+    def get_heights(self):
+        """
+        Gives a copy of the square heights, indexed row * cols + col
+        """
+        return list(self._heights)
+
+    def get_worker_squares(self):
+        """
+        Gives a copy of the dict mapping workers to their square indices
+        """
+        return dict(self._worker)
+
+    def _square(self, row, col):
+        return row * self._cols + col
+
+    def _place_worker(self, w, square):
+        """
+        Puts a worker on a square, keeping the occupancy mask, key and side scores in sync.
+        Workers are never built under, so their heights only change when they move.
+        """
+        side = self._worker_side[w]
+        if w in self._worker:
+            old = self._worker[w]
+            self._occupied &= ~(1 << old)
+            self._key ^= self._zobrist_worker[w][old]
+            self._side_height[side] -= self._heights[old]
+            self._side_center[side] -= self._center_weight[old]
+        self._worker[w] = square
+        self._occupied |= 1 << square
+        self._key ^= self._zobrist_worker[w][square]
+        self._side_height[side] += self._heights[square]
+        self._side_center[side] += self._center_weight[square]
+
+    def _add_height(self, square, amount):
+        """
+        Changes the height of a square, keeping the Zobrist key in sync
+        """
+        height = self._heights[square]
+        self._key ^= self._zobrist_height[square][height] ^ self._zobrist_height[square][height + amount]
+        self._heights[square] = height + amount
 
-        self._worker = {} 
-        self._worker['A'] = self._grid[3][1]
-        self._worker['B'] = self._grid[1][3]
-        self._worker['Y'] = self._grid[1][1]
-        self._worker['Z'] = self._grid[3][3]
+    def _get_zobrist_key(self):
+        return self._key
 
-        self._direction_indices = {"n" : [-1, 0], "ne" : [-1, 1], "e" : [0, 1], "se" : [1, 1], "s" : [1, 0], "sw" : [1, -1], "w" : [0, -1], "nw" : [-1, -1]}
+    zobrist_key = property(_get_zobrist_key)
+
+    def _target(self, w, direction):
+        """
+        Returns the square in the given direction from a worker, or None if it is off the board
+        """
+        return self._targets[self._worker[w]].get(direction)
+
+    def render(self):
+        """
+        Returns the current state of the board as text in the format of the spec
+        """
+        return frame(self)
 
     def display(self):
         """
         Displays the current state of the board according the format in the spec
         """
-        horizontal_border = '+--+--+--+--+--+'
-        for row in self._grid:
-            print(horizontal_border)
-            row_str = "|"
-            for tile in row:
-                tile_str = str(tile.height)
-                worker_on_tile = False
-                for w in self._worker:
-                    if self._worker[w] == tile:
-                        tile_str += w
-                        worker_on_tile = True
-                        break
-                if not worker_on_tile:
-                    tile_str += " "
-                row_str += tile_str + "|"
-            print(row_str)
-        print(horizontal_border)
+        print(self.render())
                 
     def valid_direction(self, direction):
         """
         Checks if a direction is n, s, e, w, ne, nw, se, sw
         """
-        if direction in self._direction_indices:
+        if direction in DIRECTIONS:
             return True
         else:
             return False
     
-    def _is_occupied(self, tile):
+    def _is_occupied(self, square):
         """
-        Checks if a tile is occupied by a worker
+        Checks if a square is occupied by a worker
         """
-        for w in self._worker:
-            if self._worker[w] == tile:
-                return True
-        return False
+        return (self._occupied >> square) & 1 == 1
     
-    def _max_height(self, tile):
+    def _max_height(self, square):
         """
-        Returns whether or not a tile has a height of 4
+        Returns whether or not a square has a height of 4
         """
-        if tile.height == 4:
-            return True
-        else:
-            return False
+        return self._heights[square] == 4
         
     def valid_move(self, w, direction):
         """
         Returns whether or not a direction is a valid move for a given worker
         """
-        row = self._worker[w].row + self._direction_indices[direction][0]
-        col = self._worker[w].col + self._direction_indices[direction][1]
-        
-        if row < 0 or row >= 5 or col < 0 or col >= 5:
+        square = self._target(w, direction)
+        if square is None:
             return False
-        temp_tile = self._grid[row][col]
-        if self._is_occupied(temp_tile):
+        if self._is_occupied(square):
             return False
-        if self._max_height(temp_tile):
+        if self._max_height(square):
             return False
-        if temp_tile.height - self._worker[w].height  >  1:
+        if self._heights[square] - self._heights[self._worker[w]] > 1:
             return False
         return True
 
@@ -98,25 +288,23 @@ class SantoriniBoard(Board):
         """
         Returns a list of valid moves
         """
-        lst = []
-        for dir in self._direction_indices:
-            if self.valid_move(w, dir):
-                lst.append(dir)
-        return lst
+        square = self._worker[w]
+        heights = self._heights
+        occupied = self._occupied
+        limit = min(heights[square] + 1, 3)
+        return [dir for dir, target in self._neighbours[square]
+                if not (occupied >> target) & 1 and heights[target] <= limit]
     
     def valid_build(self, w, direction):
         """
         Returns whether or not a direction is a valid build for a given worker
         """
-        row = self._worker[w].row + self._direction_indices[direction][0]
-        col = self._worker[w].col + self._direction_indices[direction][1]
-
-        if row < 0 or row >= 5 or col < 0 or col >= 5:
+        square = self._target(w, direction)
+        if square is None:
             return False
-        temp_tile = self._grid[row][col]
-        if self._is_occupied(temp_tile):
+        if self._is_occupied(square):
             return False
-        if self._max_height(temp_tile):
+        if self._max_height(square):
             return False
         return True
     
@@ -124,47 +312,152 @@ class SantoriniBoard(Board):
         """
         Returns a list of valid builds
         """
-        lst = []
-        for dir in self._direction_indices:
-            if self.valid_build(worker, dir):
-                lst.append(dir)
-        return lst
+        heights = self._heights
+        occupied = self._occupied
+        return [dir for dir, target in self._neighbours[self._worker[worker]]
+                if not (occupied >> target) & 1 and heights[target] < 4]
     
+    def action_list(self, workers):
+        """
+        Returns a list of every legal full turn (worker, move, build) for the given workers
+        """
+        actions = []
+        for w in workers:
+            for m in self.move_list(w):
+                undo_token = self.make_move((w, m, None))
+                for b in self.build_list(w):
+                    actions.append((w, m, b))
+                self.unmake_move(undo_token)
+        return actions
+
+    def valid_action(self, action):
+        """
+        Returns whether a full turn (worker, move, build) is legal
+        """
+        w, move_dir, build_dir = action
+        if w not in self._worker or not self.valid_move(w, move_dir):
+            return False
+        src = self._worker[w]
+        target = self._targets[self._targets[src][move_dir]].get(build_dir)
+        if target is None:
+            return False
+        # the worker has left src, so it can always be built on
+        return target == src or (not (self._occupied >> target) & 1 and self._heights[target] < 4)
+
+    def actions(self, workers, killers=(), history=None):
+        """
+        Yields every legal full turn (worker, move, build) for the given workers, one at a time,
+        so a search that cuts off early never builds the rest. Moves up come first, with the
+        winning climbs onto height 3 ahead of them, then the killers (legal turns the caller
+        wants tried early), then the other moves. Within each group moves are ordered by
+        history[(worker, move)] and each move's builds by history[(worker, move, build)].
+        """
+        heights = self._heights
+        occupied = self._occupied
+        if history is None:
+            history = {}
+        moves = []
+        for w in workers:
+            src = self._worker[w]
+            limit = min(heights[src] + 1, 3)
+            for move_dir, dst in self._neighbours[src]:
+                if not (occupied >> dst) & 1 and heights[dst] <= limit:
+                    up = heights[dst] > heights[src]
+                    moves.append((up and heights[dst] == 3, up, history.get((w, move_dir), 0), w, move_dir, src, dst))
+        moves.sort(key=lambda move: move[:3], reverse=True)
+
+        # killers that move up are yielded with the other moves up
+        killer_list = []
+        for killer in killers:
+            if (killer is not None and killer[0] in workers and killer not in killer_list and self.valid_action(killer)
+                    and self.move_height(killer[0], killer[1]) <= self.get_worker_height(killer[0])):
+                killer_list.append(killer)
+        killers_due = True
+        for _, up, _, w, move_dir, src, dst in moves:
+            if killers_due and not up:
+                killers_due = False
+                yield from killer_list
+            free = occupied & ~(1 << src)
+            builds = [build_dir for build_dir, target in self._neighbours[dst]
+                      if not (free >> target) & 1 and heights[target] < 4]
+            if history:
+                builds.sort(key=lambda build_dir: history.get((w, move_dir, build_dir), 0), reverse=True)
+            for build_dir in builds:
+                action = (w, move_dir, build_dir)
+                if up or action not in killer_list:
+                    yield action
+        if killers_due:
+            yield from killer_list
+
     def move(self, w, direction):
         """
         Moves a worker to the specifed direction
         """
-        row = self._worker[w].row + self._direction_indices[direction][0]
-        col = self._worker[w].col + self._direction_indices[direction][1]
-        self._worker[w] = self._grid[row][col]
+        self._place_worker(w, self._target(w, direction))
 
     def build(self, w, direction):
         """
         Builds on a tile relative to the worker
         """
-        row = self._worker[w].row + self._direction_indices[direction][0]
-        col = self._worker[w].col + self._direction_indices[direction][1]
-        self._grid[row][col].height += 1
+        self._add_height(self._target(w, direction), 1)
+
+    def make_move(self, action):
+        """
+        Plays a full turn given as (worker, move direction, build direction) and returns an undo
+        token for unmake_move. The build direction may be None to only move the worker.
+        """
+        w, move_dir, build_dir = action
+        src = self._worker[w]
+        dst = self._targets[src][move_dir]
+        self._place_worker(w, dst)
+        build_square = None
+        if build_dir is not None:
+            build_square = self._targets[dst][build_dir]
+            self._add_height(build_square, 1)
+        return (w, src, dst, build_square)
+
+    def unmake_move(self, undo_token):
+        """
+        Takes back a turn played with make_move
+        """
+        w, src, dst, build_square = undo_token
+        if build_square is not None:
+            self._add_height(build_square, -1)
+        self._place_worker(w, src)
+
+    def replay_move(self, undo_token):
+        """
+        Plays a turn again from the undo token make_move returned for it
+        """
+        w, src, dst, build_square = undo_token
+        self._place_worker(w, dst)
+        if build_square is not None:
+            self._add_height(build_square, 1)
+
+    def move_height(self, w, direction):
+        """
+        Gives the height of the square a worker would move onto
+        """
+        return self._heights[self._targets[self._worker[w]][direction]]
 
     def get_worker_height(self, worker):
         """
         Gives the height of the structure that the worker is on
         """
-        return self._worker[worker].height
+        return self._heights[self._worker[worker]]
     
     def is_possible_next_turn(self, worker):
         """
         Returns whether or not the a worker has a place to move to
         """
-        move = []
-        for dir in self._direction_indices:
-            new_x = self._worker[worker].row + self._direction_indices[dir][0]
-            new_y = self._worker[worker].col + self._direction_indices[dir][1]
-            if self.valid_move(worker, dir):
-                move.append(self._grid[new_x][new_y])
-        if(len(move) == 0):
-            return False
-        return True
+        square = self._worker[worker]
+        heights = self._heights
+        occupied = self._occupied
+        limit = min(heights[square] + 1, 3)
+        for _, target in self._neighbours[square]:
+            if not (occupied >> target) & 1 and heights[target] <= limit:
+                return True
+        return False
 
     def height_score(self, lst):
         """
@@ -172,7 +465,7 @@ class SantoriniBoard(Board):
         """
         sum = 0
         for w in lst:
-            sum += self._worker[w].height
+            sum += self._heights[self._worker[w]]
         return sum
     
     def center_score(self, lst):
@@ -181,29 +474,42 @@ class SantoriniBoard(Board):
         """
         sum = 0
         for w in lst:
-            row = self._worker[w].row 
-            col = self._worker[w].col
-            if (row == 2 and col == 2):
-                sum +=2
-            elif (1 <= row <= 3 and 1 <= col <= 3):
-                sum +=1
-            else:
-                sum +=0
+            sum += self._center_weight[self._worker[w]]
         return sum
     
-    def _distance(self, worker1, worker2):
-            return max(abs(worker1.row  - worker2.row), abs(worker1.col - worker2.col))
-    
     def distance_score(self, cur_workers):
         """
         Calculates the distance score according to the spec
         """
+        opponent_workers = self._sides[1 - self._worker_side[cur_workers[0]]]
         sum = 0
-        for workers in [['A', 'B'], ['Y', 'Z']]:
-            if workers != cur_workers:
-                opponent_workers = workers
         for opponent_worker in opponent_workers:
-                min_distance = min(self._distance(self._worker[cur_worker], self._worker[opponent_worker]) for cur_worker in cur_workers)
-                sum += min_distance
-        return 8 - sum
+            row = self._distance[self._worker[opponent_worker]]
+            sum += min(row[self._worker[cur_worker]] for cur_worker in cur_workers)
+        return self._max_distance - sum
 
+    def evaluate(self, workers):
+        """
+        Returns the (height, center, distance) scores of one side's workers. The height and center
+        terms are kept up to date as workers move, so this costs a few table lookups.
+        """
+        side = self._worker_side[workers[0]]
+        worker = self._worker
+        own = self._sides[side]
+        opponents = self._sides[1 - side]
+        if len(own) == 2:
+            # the standard game, unrolled
+            w1, w2 = own
+            o1, o2 = opponents
+            square1 = worker[w1]
+            square2 = worker[w2]
+            row1 = self._distance[worker[o1]]
+            row2 = self._distance[worker[o2]]
+            distance = min(row1[square1], row1[square2]) + min(row2[square1], row2[square2])
+        else:
+            squares = [worker[w] for w in own]
+            distance = 0
+            for opponent_worker in opponents:
+                row = self._distance[worker[opponent_worker]]
+                distance += min([row[square] for square in squares])
+        return self._side_height[side], self._side_center[side], self._max_distance - distance
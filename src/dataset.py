@@ -0,0 +1,104 @@
+import argparse
+import numpy as np
+from board import SantoriniBoard, SIDES
+from simulate import AI_PLAYER_TYPES, simulate
+
+# Files start with a fixed header and are then a flat array of RECORD_DTYPE records, one per
+# position played in a game: heights, worker squares (A, B, Y, Z), side to move, the height,
+# center and distance scores of the side to move and the outcome for it (1 win, -1 loss).
+MAGIC = b'SNTD\x01'.ljust(16, b'\x00')
+RECORD_DTYPE = np.dtype([
+    ('heights', 'u1', 25),
+    ('workers', 'u1', 4),
+    ('side', 'u1'),
+    ('height', 'i1'),
+    ('center', 'i1'),
+    ('distance', 'i1'),
+    ('outcome', 'i1'),
+])
+
+class DatasetWriter():
+    """
+    Game recorder that appends every position of finished games to a dataset file. It replays
+    each turn on its own board, so it works with any Game, and buffers records so bulk runs
+    write in large appends without ever reading the file back.
+    """
+    def __init__(self, path, buffer_records=1 << 16):
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._buffer = np.zeros(buffer_records, dtype=RECORD_DTYPE)
+        self._buffered = 0
+        self._board = None
+        self._positions = []
+        self._cursor = 0
+
+    def start_game(self, p1, p2, seed=None):
+        self._board = SantoriniBoard()
+        self._positions = [self._snapshot(0)]
+        self._cursor = 0
+
+    def _snapshot(self, side):
+        squares = self._board.get_worker_squares()
+        return (self._board.get_heights(), [squares[w] for w in SIDES[0] + SIDES[1]], side) + self._board.evaluate(SIDES[side])
+
+    def record_turn(self, worker, move_dir, build_dir):
+        del self._positions[self._cursor + 1:]
+        self._board.make_move((worker, move_dir, build_dir))
+        self._cursor += 1
+        self._positions.append(self._snapshot(self._cursor % 2))
+
+    def seek(self, turns):
+        """
+        Follows an undo or redo by replaying the kept turns on a fresh board
+        """
+        self._cursor = turns
+        self._board.set_position(self._positions[turns][0], dict(zip(SIDES[0] + SIDES[1], self._positions[turns][1])))
+
+    def end_game(self, winner):
+        # the last position is the finished game, where nobody moves
+        for heights, workers, side, height, center, distance in self._positions[:self._cursor]:
+            if self._buffered == len(self._buffer):
+                self.flush()
+            self._buffer[self._buffered] = (heights, workers, side, height, center, distance, 1 if side == winner else -1)
+            self._buffered += 1
+
+    def flush(self):
+        self._file.write(self._buffer[:self._buffered].tobytes())
+        self._file.flush()
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_dataset(path, mode='r'):
+    """
+    Maps a dataset file as a NumPy record array without reading it into memory
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a dataset file")
+    return np.memmap(path, dtype=RECORD_DTYPE, mode=mode, offset=len(MAGIC))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Appends self-play positions to a memory-mappable dataset file")
+    parser.add_argument('path')
+    parser.add_argument('--p1', choices=AI_PLAYER_TYPES, default='heuristic', help="white player type")
+    parser.add_argument('--p2', choices=AI_PLAYER_TYPES, default='heuristic', help="blue player type")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with DatasetWriter(args.path) as writer:
+        simulate(args.p1, args.p2, args.games, args.seed, writer)
+    print(f"{args.path}: {len(open_dataset(args.path))} positions")
+
+if __name__ == "__main__":
+    main()
@@ -1,95 +1,181 @@
+import random
 from board import SantoriniBoard
+from player import HumanPlayer
 from player_factory import make_player
 from memento import Originator, Caretaker
+from renderer import TextRenderer, NullRenderer
 # from player_iterator import PlayerIterator
 
 class Game():
     """
     Sets up the Santorini game by creating a board and players
     """
-    def __init__(self, *args):
+    def __init__(self, *args, rng=None, seed=None, verbose=True, recorder=None, size=5, workers_per_side=2, renderer=None, ponder=False):
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
         self._players = []
         self._white_player_id = 0
         self._blue_player_id = 1
-        self._board = SantoriniBoard()
-        self._white_player = make_player(self._white_player_id, args[0], self._board)
-        self._blue_player = make_player(self._blue_player_id, args[1], self._board)
+        self._board = SantoriniBoard(size, size, workers_per_side)
+        self._white_player = make_player(self._white_player_id, args[0], self._board, rng)
+        self._blue_player = make_player(self._blue_player_id, args[1], self._board, rng)
         self._enable_undo = args[2]
         self._enable_score = args[3]
         self._players.append(self._white_player)
         self._players.append(self._blue_player)
         self._turn_num = 1
         self._current_player = 0
+        if renderer is None:
+            renderer = TextRenderer() if verbose else NullRenderer()
+        self._renderer = renderer
+        # let an AI player search in the background while a human thinks
+        self._ponder = ponder
+        self._player_types = (args[0], args[1])
+        self._seed = seed
+        self._recorder = recorder
+        self._originator = Originator(self._board, self._turn_num)
+        self._caretaker = Caretaker(self._originator)
+        self._caretaker.backup()
+        if self._recorder is not None:
+            self._recorder.start_game(*self._player_types, self._seed)
+
+    def _get_turn_num(self):
+        return self._turn_num
+
+    turn_num = property(_get_turn_num)
+
+    def _get_board(self):
+        return self._board
+
+    board = property(_get_board)
+
+    def _output(self, text):
+        """
+        Prints a line of game output unless the game runs headless
+        """
+        self._renderer.line(text)
 
     def play_game(self):
         """
-        Starts the game
+        Starts the game and returns the id of the winning player
         """
-        originator = Originator(self._board, self._turn_num)
-        caretaker = Caretaker(originator)
-        caretaker.backup()
         while(True):
-            self._board.display()
+            self._renderer.draw(self._board)
 
             # cur_player = player_iterator.next_player()
             # prev_player = player_iterator.previous_player()
 
-            cur_player = self._players[self._current_player]
-            prev_player = self._players[(self._current_player - 1) % 2]
-
-            if self._enable_score:
-                print(f"Turn: {self._turn_num}, {cur_player.format()}, ({cur_player.print_move_score()})")
-            else:
-                print(f"Turn: {self._turn_num}, {cur_player.format()}")
+            self._output(self.turn_header())
 
             choice = None
 
             if self._enable_undo:
-                print("undo, redo, or next")
+                self._output("undo, redo, or next")
                 choice = input()
 
             if choice == "undo":
-                caretaker.undo()
-                self._restore_game(originator)
+                self.undo()
             elif choice == "redo":
-                caretaker.redo()
-                self._restore_game(originator)
+                self.redo()
             else:
-                if not cur_player.next_move_possible() or prev_player.win():
-                    print(f"{prev_player.color} has won")
+                winner = self.winner()
+                if winner is not None:
+                    self._output(f"{self._players[winner].color} has won")
+                    self.end_game(winner)
+                    return winner
+                self._output(self.play_turn(*self.choose_turn()))
+
+    def player(self, id):
+        return self._players[id]
+
+    def current_player(self):
+        return self._players[self._current_player]
+
+    def turn_header(self):
+        """
+        Returns the line announcing the turn, with the current player's scores if enabled
+        """
+        cur_player = self.current_player()
+        if self._enable_score:
+            return f"Turn: {self._turn_num}, {cur_player.format()}, ({cur_player.print_move_score()})"
+        return f"Turn: {self._turn_num}, {cur_player.format()}"
+
+    def winner(self):
+        """
+        Returns the id of the player who has won, or None while the game goes on
+        """
+        cur_player = self._players[self._current_player]
+        prev_player = self._players[(self._current_player - 1) % 2]
+        if not cur_player.next_move_possible() or prev_player.win():
+            return self._players.index(prev_player)
+        return None
+
+    def end_game(self, winner):
+        if self._recorder is not None:
+            self._recorder.end_game(winner)
+
+    def choose_turn(self):
+        """
+        Asks the current player for a full turn and returns it as (worker, move, build) without
+        playing it
+        """
+        cur_player = self.current_player()
+        opponent = self._players[(self._current_player + 1) % 2]
+        pondering = self._ponder and isinstance(cur_player, HumanPlayer)
+        if pondering:
+            opponent.start_pondering()
+        try:
+            while(True):
+                worker = cur_player.select_worker()
+                if self._board.is_possible_next_turn(worker):
                     break
-                
-                while(True):
-                    worker = cur_player.select_worker()
-                    if self._board.is_possible_next_turn(worker):
-                        break
-                    else:
-                        print("That worker cannot move")
-
-                move_dir = cur_player.select_move_direction(worker)
-                self._board.move(worker, move_dir)
-                build_dir = cur_player.select_build_direction(worker)
-                self._board.build(worker, build_dir)
-
-                if self._enable_score:
-                    print(f"{worker},{move_dir},{build_dir} ({cur_player.print_move_score()})")
                 else:
-                    print(f"{worker},{move_dir},{build_dir}")
-                
-                self._current_player = self._turn_num % 2
-                # cur_player = player_iterator.next_player()
-                self._turn_num += 1
-
-                originator.set_state(self._board, self._turn_num)
-                caretaker.backup()
-    
-    def _restore_game(self, originator):
-        old_state = originator.get_state()
-        self._board = old_state[0]
-        self._turn_num = old_state[1]
-        self._current_player = (self._turn_num - 1) % 2
+                    self._output("That worker cannot move")
 
+            move_dir = cur_player.select_move_direction(worker)
+            undo_token = self._board.make_move((worker, move_dir, None))
+            build_dir = cur_player.select_build_direction(worker)
+            self._board.unmake_move(undo_token)
+        finally:
+            if pondering:
+                opponent.stop_pondering()
+        return worker, move_dir, build_dir
 
+    def play_turn(self, worker, move_dir, build_dir):
+        """
+        Plays a full turn for the current player, saves it in the history and returns the line
+        describing it
+        """
+        cur_player = self.current_player()
+        undo_token = self._board.make_move((worker, move_dir, build_dir))
+        if self._recorder is not None:
+            self._recorder.record_turn(worker, move_dir, build_dir)
+
+        if self._enable_score:
+            line = f"{worker},{move_dir},{build_dir} ({cur_player.print_move_score()})"
+        else:
+            line = f"{worker},{move_dir},{build_dir}"
+
+        self._current_player = self._turn_num % 2
+        # cur_player = player_iterator.next_player()
+        self._turn_num += 1
 
+        self._originator.set_state(self._board, self._turn_num, undo_token)
+        self._caretaker.backup()
+        return line
 
+    def undo(self):
+        self._caretaker.undo()
+        self._restore_game()
+
+    def redo(self):
+        self._caretaker.redo()
+        self._restore_game()
     
+    def _restore_game(self):
+        old_state = self._originator.get_state()
+        self._board = old_state[0]
+        self._turn_num = old_state[1]
+        self._current_player = (self._turn_num - 1) % 2
+        if self._recorder is not None:
+            self._recorder.seek(self._turn_num - 1)
@@ -0,0 +1,162 @@
+import cProfile
+import collections
+import functools
+import os
+import pstats
+import time
+from board import SantoriniBoard
+import player
+
+# Board methods that are counted and timed. Times are cumulative, so a method that calls
+# another one includes its time.
+BOARD_METHODS = ('valid_move', 'valid_build', 'move_list', 'build_list', 'action_list',
+                 'make_move', 'unmake_move', 'height_score', 'center_score', 'distance_score',
+                 'evaluate')
+# Player decisions whose every call's latency is kept
+SELECT_METHODS = ('select_worker', 'select_move_direction', 'select_build_direction')
+
+class Profile():
+    """
+    Call counts and cumulative seconds per instrumented function, and the latency of every
+    player decision
+    """
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.seconds = collections.Counter()
+        self.latencies = collections.defaultdict(list)
+
+    def merge(self, other):
+        self.calls.update(other.calls)
+        self.seconds.update(other.seconds)
+        for name, latencies in other.latencies.items():
+            self.latencies[name].extend(latencies)
+
+    def brief(self):
+        """
+        Returns a one-line summary of the player decisions
+        """
+        latencies = sorted(latency for values in self.latencies.values() for latency in values)
+        board_calls = sum(self.calls[f"SantoriniBoard.{name}"] for name in BOARD_METHODS)
+        if not latencies:
+            return f"0 decisions, {board_calls} board calls"
+        return (f"{len(latencies)} decisions, mean {sum(latencies) / len(latencies) * 1000:.2f} ms, "
+                f"max {latencies[-1] * 1000:.2f} ms, {board_calls} board calls")
+
+    def summary(self, title):
+        """
+        Returns a table of every instrumented function and decision
+        """
+        lines = [f"{title}:", f"{'function':40} {'calls':>10} {'total ms':>10} {'us/call':>9}"]
+        for name in sorted(self.calls, key=self.seconds.__getitem__, reverse=True):
+            if name in self.latencies:
+                continue
+            calls, seconds = self.calls[name], self.seconds[name]
+            lines.append(f"{name:40} {calls:10} {seconds * 1000:10.1f} {seconds / calls * 1e6:9.2f}")
+        if self.latencies:
+            lines.append(f"{'decision':40} {'calls':>10} {'mean ms':>10} {'p95 ms':>9} {'max ms':>9}")
+            for name in sorted(self.latencies):
+                latencies = sorted(self.latencies[name])
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                lines.append(f"{name:40} {len(latencies):10} {sum(latencies) / len(latencies) * 1000:10.2f} "
+                             f"{p95 * 1000:9.2f} {latencies[-1] * 1000:9.2f}")
+        return "\n".join(lines)
+
+_profile = Profile()
+_originals = {}
+# decisions being timed right now, so a nested call of the same decision is not timed again
+_deciding = set()
+
+def _counted(name, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _profile.calls[name] += 1
+            _profile.seconds[name] += time.perf_counter() - start
+    return wrapper
+
+def _timed(name, function):
+    method = function.__name__
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if method in _deciding:
+            # an override calling the base class's wrapped method: the outer call times both
+            return function(*args, **kwargs)
+        _deciding.add(method)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _deciding.discard(method)
+            _profile.calls[name] += 1
+            _profile.seconds[name] += elapsed
+            _profile.latencies[name].append(elapsed)
+    return wrapper
+
+def _player_classes():
+    classes = [player.Player]
+    for cls in classes:
+        classes.extend(cls.__subclasses__())
+    return classes
+
+def _wrap(cls, method, wrapper):
+    original = cls.__dict__[method]
+    _originals[(cls, method)] = original
+    setattr(cls, method, wrapper(f"{cls.__name__}.{method}", original))
+
+def enable():
+    """
+    Replaces the instrumented methods with counting wrappers. Until this is called nothing is
+    wrapped, so the game runs at full speed.
+    """
+    if _originals:
+        return
+    for method in BOARD_METHODS:
+        _wrap(SantoriniBoard, method, _counted)
+    _wrap(player.MinimaxPlayer, '_evaluate', _counted)
+    _wrap(player.HeuristicPlayer, '_move_score', _counted)
+    for cls in _player_classes():
+        for method in SELECT_METHODS:
+            if method in cls.__dict__:
+                _wrap(cls, method, _timed)
+
+def disable():
+    """
+    Puts the original methods back
+    """
+    for (cls, method), original in _originals.items():
+        setattr(cls, method, original)
+    _originals.clear()
+
+def enabled():
+    return bool(_originals)
+
+def enable_from_environment():
+    """
+    Enables instrumentation if the SANTORINI_PROFILE environment variable is set to anything
+    but 0, and returns whether it is enabled
+    """
+    if os.environ.get('SANTORINI_PROFILE', '0') not in ('', '0'):
+        enable()
+    return enabled()
+
+def take():
+    """
+    Returns the profile gathered since the last take and starts a new one
+    """
+    global _profile
+    profile, _profile = _profile, Profile()
+    return profile
+
+def profiled(function, path, *args, **kwargs):
+    """
+    Runs a function under cProfile, writes the stats to path and returns the function's result
+    with the stats
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args, **kwargs)
+    profiler.dump_stats(path)
+    return result, pstats.Stats(profiler)
@@ -1,8 +1,12 @@
+import os
 import sys
+import instrument
 from game import Game
+from player_factory import PLAYER_TYPES
+from renderer import make_renderer
 
-valid_args = [['human', 'heuristic', 'random'], ['human', 'heuristic', 'random'], ['on', 'off'], ['on', 'off']]
-args = ["human", "human", "off", "off"]
+valid_args = [PLAYER_TYPES, PLAYER_TYPES, ['on', 'off'], ['on', 'off'], ['on', 'off']]
+args = ["human", "human", "off", "off", "off"]
 
 for x in range(1, len(sys.argv)):
     if(sys.argv[x] in valid_args[x - 1]):
@@ -17,13 +21,23 @@ p1 = args[0]
 p2 = args[1]
 enable_undo = False if args[2] == "off" else True
 enable_score = False if args[3] == "off" else True
+enable_ponder = False if args[4] == "off" else True
 
 
-while True:
-    game = Game(p1, p2, enable_undo, enable_score)
-    game.play_game()
-    print("Play again?")
-    response = input()
-    if response != "yes":
-        break
+profiling = instrument.enable_from_environment()
+# text, or ansi to keep the board in place at the top of the terminal
+renderer = make_renderer(os.environ.get('SANTORINI_RENDERER', 'text'))
+
+try:
+    while True:
+        game = Game(p1, p2, enable_undo, enable_score, renderer=renderer, ponder=enable_ponder)
+        game.play_game()
+        if profiling:
+            print(instrument.take().summary("game"))
+        print("Play again?")
+        response = input()
+        if response != "yes":
+            break
+finally:
+    renderer.close()
 
@@ -1,32 +1,36 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from copy import deepcopy
 
 class Originator():
     """
     The Originator holds some important state that may change over time. It also
     defines a method for saving the state inside a memento and another method
     for restoring the state from it.
+
+    Only the change made by each turn is saved: the board is shared with the game and
+    mementos are moved between by taking back or replaying those changes in place.
     """
 
     
     def __init__(self, board, turn) -> None:
-        self._board = deepcopy(board)
+        self._board = board
         self._turn = turn
+        self._delta = None
 
     def save(self) -> Memento:
         """
         Saves the current state inside a memento.
         """
 
-        return ConcreteMemento(self._board, self._turn)
+        return ConcreteMemento(self._delta, self._turn)
     
-    def set_state(self, board, turn) -> None:
+    def set_state(self, board, turn, delta=None) -> None:
         """
-        Alters the current state.
+        Alters the current state. The delta is the undo token of the turn that led to it.
         """
-        self._board = deepcopy(board)
-        self._turn = turn  
+        self._board = board
+        self._turn = turn
+        self._delta = delta
 
     def get_state(self):
         """
@@ -36,12 +40,23 @@ class Originator():
 
     def restore(self, memento: Memento) -> None:
         """
-        Restores the Originator's state from a memento object.
+        Restores the Originator's state from the memento directly after the current one by
+        replaying its turn.
+        """
+
+        delta, turn = memento.get_state()
+        self._board.replay_move(delta)
+        self._delta = delta
+        self._turn = turn
+
+    def revert(self, memento: Memento, previous: Memento) -> None:
+        """
+        Restores the Originator's state from the memento directly before the current one by
+        taking back the current turn.
         """
 
-        self._state = memento.get_state()
-        self._board = deepcopy(self._state[0])
-        self._turn = self._state[1]  
+        self._board.unmake_move(memento.get_state()[0])
+        self._delta, self._turn = previous.get_state()
 
 class Memento(ABC):
     """
@@ -56,15 +71,19 @@ class Memento(ABC):
 
 
 class ConcreteMemento(Memento):
-    def __init__(self, board, turn) -> None:
-        self._board = deepcopy(board)
+    """
+    Holds one turn's change to the board (worker, from square, to square, build square)
+    and the turn number it led to.
+    """
+    def __init__(self, delta, turn) -> None:
+        self._delta = delta
         self._turn = turn
 
     def get_state(self):
         """
         The Originator uses this method when restoring its state.
         """
-        return [self._board, self._turn]
+        return [self._delta, self._turn]
 
 class Caretaker():
     """
@@ -91,9 +110,9 @@ class Caretaker():
         Roll back to a previous state
         """
         if self._current_index > 0:
-            self._current_index -= 1
             memento = self._mementos[self._current_index]
-            self._originator.restore(memento)
+            self._current_index -= 1
+            self._originator.revert(memento, self._mementos[self._current_index])
     
     def redo(self) -> None:
         """
@@ -0,0 +1,50 @@
+from board import SantoriniBoard, worker_sides
+
+# A position is written as its heights row by row with rows separated by '/', the worker squares
+# in order (white's workers, then blue's) separated by commas, and the side to move, w or b:
+#   00000/00000/00000/00000/00000 16,8,6,18 w
+# is the opening layout. The board size and workers per side follow from the text.
+SIDE_NAMES = ('w', 'b')
+HEIGHT_DIGITS = frozenset('01234')
+
+def format_position(board, side):
+    """
+    Returns the notation of a board with the given side (0 white, 1 blue) to move
+    """
+    heights = "".join(map(str, board.get_heights()))
+    cols = board.cols
+    rows = "/".join(heights[start:start + cols] for start in range(0, len(heights), cols))
+    squares = board.get_worker_squares()
+    workers = ",".join(str(squares[w]) for w in board.sides[0] + board.sides[1])
+    return f"{rows} {workers} {SIDE_NAMES[side]}"
+
+def parse_position(text):
+    """
+    Returns (board, side to move) for a position in the notation. Raises ValueError if the
+    text is not a legal position.
+    """
+    fields = text.split()
+    if len(fields) != 3:
+        raise ValueError(f"expected heights, worker squares and side to move: {text!r}")
+    rows, workers, side = fields
+    rows = rows.split("/")
+    cols = len(rows[0])
+    if any(len(row) != cols for row in rows):
+        raise ValueError(f"rows of different lengths: {fields[0]!r}")
+    heights = "".join(rows)
+    if not HEIGHT_DIGITS.issuperset(heights):
+        raise ValueError(f"heights must be 0 to 4: {fields[0]!r}")
+    heights = list(map(int, heights))
+    try:
+        squares = [int(square) for square in workers.split(",")]
+    except ValueError:
+        raise ValueError(f"worker squares must be numbers: {workers!r}") from None
+    if len(squares) % 2 or len(set(squares)) != len(squares):
+        raise ValueError(f"expected an even number of different worker squares: {workers!r}")
+    if any(not 0 <= square < len(heights) or heights[square] == 4 for square in squares):
+        raise ValueError(f"workers must stand on the board below a dome: {workers!r}")
+    if side not in SIDE_NAMES:
+        raise ValueError(f"side to move must be w or b: {side!r}")
+    white, blue = worker_sides(len(squares) // 2)
+    board = SantoriniBoard(len(rows), cols, len(white), (heights, dict(zip(white + blue, squares))))
+    return board, SIDE_NAMES.index(side)
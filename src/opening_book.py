@@ -0,0 +1,140 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from board import SantoriniBoard, DIRECTIONS, SIDES
+from symmetry import canonical_form, encode_action, decode_action
+
+# A book file is the magic bytes and a record count, then records sorted by key. A record is a
+# canonical position key (symmetry.canonical_form) and the best full turn in that key's frame as
+# the worker's square, move direction and build direction.
+MAGIC = b'SNTB\x01'
+COUNT = struct.Struct('<I')
+KEY_SIZE = 4 + 1 + 25
+RECORD_SIZE = KEY_SIZE + 3
+HEADER_SIZE = len(MAGIC) + COUNT.size
+
+DIRECTION_NAMES = list(DIRECTIONS)
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+class OpeningBook():
+    """
+    Read-only view of a book file. Nothing is read until the first lookup, which memory-maps the
+    file; lookups are binary searches over the mapped records.
+    """
+    def __init__(self, path):
+        self._path = path
+        self._data = None
+        self._count = 0
+
+    def _open(self):
+        if self._data is None:
+            self._data = b''
+            if self._path is not None and os.path.exists(self._path):
+                with open(self._path, 'rb') as file:
+                    self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if self._data[:len(MAGIC)] != MAGIC:
+                    raise ValueError(f"{self._path} is not an opening book")
+                self._count = COUNT.unpack_from(self._data, len(MAGIC))[0]
+        return self._data
+
+    def __len__(self):
+        self._open()
+        return self._count
+
+    def lookup(self, board, side):
+        """
+        Returns the book's full turn for a position, or None if it is not in the book
+        """
+        data = self._open()
+        if not self._count:
+            return None
+        key, t = canonical_form(board, side)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER_SIZE + middle * RECORD_SIZE
+            record_key = data[start:start + KEY_SIZE]
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                square, move_code, build_code = data[start + KEY_SIZE:start + RECORD_SIZE]
+                return decode_action(board, (square, DIRECTION_NAMES[move_code], DIRECTION_NAMES[build_code]), t)
+        return None
+
+_shared = None
+
+def get_opening_book():
+    """
+    Returns the book consulted by the search players: the file named by the SANTORINI_BOOK
+    environment variable, or opening_book.bin next to this module. A missing file is an empty book.
+    """
+    global _shared
+    if _shared is None:
+        _shared = OpeningBook(os.environ.get('SANTORINI_BOOK', DEFAULT_PATH))
+    return _shared
+
+def build_book(plies, depth, time_limit=60.0, progress=None):
+    """
+    Searches every position reachable in up to plies turns from the opening layout, one per
+    symmetry class, to the given depth. Returns a dict of canonical key to encoded best turn.
+    """
+    from player import MinimaxPlayer
+    board = SantoriniBoard()
+    frontier = {canonical_form(board, 0)[0]: (board.get_heights(), board.get_worker_squares())}
+    book = {}
+    for ply in range(plies + 1):
+        side = ply % 2
+        next_frontier = {}
+        for key, (heights, squares) in frontier.items():
+            board.set_position(heights, squares)
+            player = MinimaxPlayer(side, board, time_limit=time_limit, max_depth=depth)
+            action = player.search()
+            book[key] = encode_action(board, action, canonical_form(board, side)[1])
+            if progress is not None:
+                progress(ply, len(book))
+            if ply == plies:
+                continue
+            for child_action in board.action_list(SIDES[side]):
+                undo_token = board.make_move(child_action)
+                if board.get_worker_height(child_action[0]) != 3:
+                    child_key = canonical_form(board, 1 - side)[0]
+                    if child_key not in next_frontier:
+                        next_frontier[child_key] = (board.get_heights(), board.get_worker_squares())
+                board.unmake_move(undo_token)
+        frontier = next_frontier
+    return book
+
+def write_book(path, book):
+    """
+    Writes a book dict as a sorted record file
+    """
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(COUNT.pack(len(book)))
+        for key in sorted(book):
+            square, move_dir, build_dir = book[key]
+            file.write(key + bytes([square, DIRECTION_NAMES.index(move_dir), DIRECTION_NAMES.index(build_dir)]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Builds an opening book of deep-search replies for the first turns")
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--plies', type=int, default=2, help="turns from the opening layout to cover")
+    parser.add_argument('--depth', type=int, default=3, help="search depth in full turns")
+    parser.add_argument('--time-limit', type=float, default=60.0, help="seconds per position before the search stops deepening")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def progress(ply, positions):
+        print(f"\rply {ply}: {positions} positions", end="", flush=True)
+
+    book = build_book(args.plies, args.depth, args.time_limit, progress)
+    write_book(args.path, book)
+    print(f"\n{args.path}: {len(book)} positions in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import time
+from board import SantoriniBoard
+from notation import parse_position
+
+# Full-turn leaf counts from the opening layout, white to move. A turn that climbs to height 3
+# ends the game, so the position after it is a leaf but is never expanded.
+KNOWN_NODE_COUNTS = {
+    1: 80,
+    2: 6176,
+    3: 426384,
+    4: 29096316,
+}
+
+def perft(board, side, depth, counts, ply=1):
+    """
+    Counts the positions reachable in exactly depth full turns, adding the count at each ply
+    into counts[ply]. Returns the number of leaves.
+    """
+    actions = board.action_list(board.sides[side])
+    counts[ply] += len(actions)
+    if depth == 1:
+        return len(actions)
+    leaves = 0
+    for action in actions:
+        undo_token = board.make_move(action)
+        if board.get_worker_height(action[0]) != 3:
+            leaves += perft(board, 1 - side, depth - 1, counts, ply + 1)
+        board.unmake_move(undo_token)
+    return leaves
+
+def run(board, side, depth):
+    """
+    Runs perft to the given depth and returns the per-ply node counts and elapsed seconds
+    """
+    counts = [0] * (depth + 1)
+    start = time.perf_counter()
+    perft(board, side, depth, counts)
+    return counts[1:], time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Counts full-turn (worker x move x build) leaf positions to a given depth")
+    parser.add_argument('depth', type=int)
+    parser.add_argument('--verify', action='store_true', help="check the counts from the opening layout against the known values")
+    parser.add_argument('--position', help="count from this position (in position notation) instead of the opening layout")
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("depth must be at least 1")
+    if args.verify and args.position:
+        parser.error("--verify only checks counts from the opening layout")
+
+    if args.position:
+        try:
+            board, side = parse_position(args.position)
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        board, side = SantoriniBoard(), 0
+    counts, elapsed = run(board, side, args.depth)
+    total = sum(counts)
+    failed = False
+    for ply, count in enumerate(counts, 1):
+        line = f"depth {ply}: {count}"
+        if args.verify and ply in KNOWN_NODE_COUNTS:
+            ok = KNOWN_NODE_COUNTS[ply] == count
+            failed = failed or not ok
+            line += " ok" if ok else f" MISMATCH (expected {KNOWN_NODE_COUNTS[ply]})"
+        print(line)
+    print(f"{total} nodes in {elapsed:.2f} s ({total / elapsed:.0f} nodes/s)")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,27 @@
+import itertools
+import math
+import multiprocessing
+import os
 import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import SantoriniBoard, ZOBRIST_SIDE
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from tablebase import get_tablebase
+from opening_book import get_opening_book
 
 class Player():
     """
     This is an abstract class for players. Provides select worker, move, and build 
     capabilities, checks terminal conditions, and handles output
     """
-    def __init__(self, id, board):
+    def __init__(self, id, board, rng=None):
         self._board = board
         self._id = id
-        self._worker_list = [['A', 'B'], ['Y', 'Z']]
+        # any object with random.Random's interface; defaults to the module-level generator
+        self._rng = rng if rng is not None else random
+        self._worker_list = [list(workers) for workers in board.sides]
         if id == 0:
             self._workers = self._worker_list[0]
             self._color = "white"
@@ -37,8 +50,37 @@ class Player():
         """
         lst = self._board.build_list(worker)
         if len(lst) != 0:
-            return random.choice(lst)
+            return self._rng.choice(lst)
     
+    def _book_action(self):
+        """
+        Returns the opening book's full turn for the current position, or None
+        """
+        if not self._board.is_standard():
+            return None
+        return get_opening_book().lookup(self._board, self._id)
+
+    def _solved_action(self):
+        """
+        Returns the tablebase's full turn when the current position is small enough to solve, or None
+        """
+        if not self._board.is_standard():
+            return None
+        return get_tablebase().best_action(self._board, self._id)
+
+    def start_pondering(self):
+        """
+        Called when the opponent starts thinking about a turn. Players that can use the time
+        start working in the background here.
+        """
+        pass
+
+    def stop_pondering(self):
+        """
+        Called when the opponent has chosen its turn
+        """
+        pass
+
     # terminal conditions
     def win(self):
         """
@@ -63,38 +105,28 @@ class Player():
         """
         Outputs according to the spec
         """
-        return f"{self._color} ({self._workers[0]}{self._workers[1]})"
+        return f"{self._color} ({''.join(self._workers)})"
 
     def print_move_score(self):
         """
         Prints out the scores
         """
-        self._height_score = self._board.height_score(self._workers)
-        self._center_score = self._board.center_score(self._workers)
-        self._distance_score = self._board.distance_score(self._workers)
+        self._height_score, self._center_score, self._distance_score = self._board.evaluate(self._workers)
         return f"{self._height_score}, {self._center_score}, {self._distance_score}"
     
 class RandomPlayer(Player):
     """
     Concrete class for the random player implementation
     """
-    def __init__(self, id, board):
-        super().__init__(id, board)
+    def __init__(self, id, board, rng=None):
+        super().__init__(id, board, rng)
 
     def select_worker(self):
         """
         Selects a valid worker randomly
         """
-        worker1 = self._board.is_possible_next_turn(self._workers[0])
-        worker2 = self._board.is_possible_next_turn(self._workers[1])
-
-        if(worker1 and worker2):
-            worker = random.choice(self._workers)
-        elif(worker1 and not worker2):
-            worker = self._workers[0]
-        else:
-            worker = self._workers[1]
-        return worker
+        movable = [w for w in self._workers if self._board.is_possible_next_turn(w)]
+        return self._rng.choice(movable)
     
     def select_move_direction(self, worker):
         """
@@ -102,14 +134,14 @@ class RandomPlayer(Player):
         """
         lst = self._board.move_list(worker)
         if len(lst) != 0:
-            return random.choice(lst)
+            return self._rng.choice(lst)
     
 class HeuristicPlayer(Player):
     """
     Concrete class for the heuristic player implementation
     """
-    def __init__(self, id, board):
-        super().__init__(id, board)
+    def __init__(self, id, board, rng=None):
+        super().__init__(id, board, rng)
         self._result = None
     
     def select_worker(self):
@@ -132,35 +164,542 @@ class HeuristicPlayer(Player):
         c1 = 3
         c2 = 2
         c3 = 1
-        opp_directions = {'n':'s', 'ne':'sw', 'e':'w', 'se':'nw', 's':'n', 'sw':'ne', 'w':'e', 'nw':'se'}
         for w in self._workers:
             if self._board.is_possible_next_turn(w):
                 move_list = self._board.move_list(w)
                 for m in move_list:
-                    self._board.move(w, m)
-                    height_score = self._board.height_score(self._workers)
-                    center_score = self._board.center_score(self._workers)
-                    distance_score = self._board.distance_score(self._workers)
+                    undo_token = self._board.make_move((w, m, None))
+                    height_score, center_score, distance_score = self._board.evaluate(self._workers)
                     if self.win():
                         move_score = 1000000000
                     else:
                         move_score = c1*height_score + c2*center_score + c3*distance_score
-                    self._board.move(w, opp_directions[m])
+                    self._board.unmake_move(undo_token)
                     score_dict[move_score] = [w, m]
         max_score = max(score_dict.keys())
         scores_worker_move = []
         for move_score in score_dict:
             if move_score == max_score:
                 scores_worker_move.append(score_dict[move_score])
-        result = random.choice(scores_worker_move)
+        result = self._rng.choice(scores_worker_move)
         return result
         
+class _SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget for a move runs out
+    """
+
+def _search_share(id, shape, heights, worker_squares, actions, deadline, max_depth):
+    """
+    Runs in a search process: deepens over one share of the root turns until the parent's
+    wall-clock deadline and returns the (depth, score, action) reached at each completed depth.
+    shape is the board's (rows, cols, workers per side).
+    """
+    board = SantoriniBoard(*shape)
+    board.set_position(heights, worker_squares)
+    return MinimaxPlayer(id, board, max_depth=max_depth, processes=1)._deepen(actions, deadline)
+
+class MinimaxPlayer(Player):
+    """
+    Concrete class for a search player. Runs a negamax search with alpha-beta pruning over full
+    turns (move and build), deepening one turn at a time until its per-move time budget runs out.
+    With more than one process the root turns are split between that many search processes.
+    While pondering it searches the positions after the opponent's likely replies in a
+    background thread and reuses that work when one of them comes up.
+    """
+    WIN_SCORE = 1000000000
+
+    def __init__(self, id, board, rng=None, time_limit=1.0, max_depth=20, table=None, processes=None, ponder_replies=8):
+        super().__init__(id, board, rng)
+        if processes is None:
+            processes = int(os.environ.get('SANTORINI_SEARCH_PROCESSES', 1))
+        if multiprocessing.parent_process() is not None:
+            # already in a worker process (tournament, analysis, server or search), which must
+            # not start a pool of its own
+            processes = 1
+        self._processes = processes
+        self._executor = None
+        self._opponent_workers = self._worker_list[1 - self._worker_list.index(self._workers)]
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._table = table if table is not None else TranspositionTable()
+        self._deadline = None
+        self._result = None
+        # move ordering: two killer turns per remaining depth and a history score per move and turn
+        self._killers = []
+        self._history = {}
+        self._ponder_replies = ponder_replies
+        self._ponderer = None
+        self._ponder_thread = None
+        self._ponder_stop = None
+        # (depth, score, best action) of the pondered positions, by Zobrist key
+        self._pondered = {}
+
+    def select_worker(self):
+        """
+        Searches for the best full turn and selects its worker
+        """
+        self._result = self._search()
+        return self._result[0]
+
+    def select_move_direction(self, worker):
+        """
+        Selects the move of the best full turn
+        """
+        return self._result[1]
+
+    def select_build_direction(self, worker):
+        """
+        Selects the build of the best full turn
+        """
+        return self._result[2]
+
+    def _evaluate(self, workers, opponent_workers):
+        """
+        Scores the position for the given workers with the heuristic weights, relative to the opponent
+        """
+        height, center, distance = self._board.evaluate(workers)
+        opponent_height, opponent_center, opponent_distance = self._board.evaluate(opponent_workers)
+        return 3*(height - opponent_height) + 2*(center - opponent_center) + distance - opponent_distance
+
+    def _get_table(self):
+        return self._table
+
+    table = property(_get_table)
+
+    def _search(self):
+        """
+        Plays from the opening book or the tablebase when the position is in them, and searches otherwise
+        """
+        known_action = self._book_action() or self._solved_action()
+        if known_action is not None:
+            return known_action
+        return self.search()
+
+    def search(self):
+        """
+        Returns the best action of the deepest completed iteration, or of the pondering search
+        if that went deeper
+        """
+        self.stop_pondering()
+        pondered = self._pondered.get(self._board.zobrist_key)
+        if pondered is not None and not self._board.valid_action(pondered[2]):
+            pondered = None
+        if pondered is not None and (pondered[0] >= self._max_depth or abs(pondered[1]) >= self.WIN_SCORE):
+            return pondered[2]
+        actions = list(self._board.actions(self._workers))
+        if self._processes > 1 and len(actions) > 1:
+            return self._parallel_search(actions)
+        results = self._deepen(actions)
+        if pondered is not None and (not results or pondered[0] > results[-1][0]):
+            return pondered[2]
+        return results[-1][2] if results else actions[0]
+
+    def start_pondering(self):
+        """
+        Starts searching, in a background thread, the positions after the opponent's likely
+        replies. The thread works on a copy of the board and shares this player's transposition
+        table, so the next search finds its work either in the table or in the pondered results.
+        """
+        self.stop_pondering()
+        board = SantoriniBoard(self._board.rows, self._board.cols, len(self._workers),
+                               (self._board.get_heights(), self._board.get_worker_squares()))
+        self._pondered = {}
+        self._ponderer = MinimaxPlayer(self._id, board, time_limit=float('inf'), max_depth=self._max_depth,
+                                       table=self._table, processes=1, ponder_replies=self._ponder_replies)
+        self._ponderer._deadline = float('inf')
+        self._ponder_stop = threading.Event()
+        self._ponder_thread = threading.Thread(target=self._ponderer._ponder, args=(self._ponder_stop, self._pondered), daemon=True)
+        self._ponder_thread.start()
+
+    def stop_pondering(self):
+        """
+        Stops the pondering thread at its next node and waits for it
+        """
+        if self._ponder_thread is not None:
+            self._ponder_stop.set()
+            self._ponderer._deadline = float('-inf')
+            self._ponder_thread.join()
+            self._ponder_thread = None
+            self._ponderer = None
+
+    def _ponder(self, stop, pondered):
+        """
+        Runs in the pondering thread. Ranks the opponent's replies by their heuristic score for
+        the opponent and deepens one turn at a time over the most likely ones, recording each
+        completed search in pondered.
+        """
+        board = self._board
+        replies = []
+        for reply in board.actions(self._opponent_workers):
+            undo_token = board.make_move(reply)
+            # replies that end the game leave nothing to search
+            if board.get_worker_height(reply[0]) != 3 and any(board.is_possible_next_turn(w) for w in self._workers):
+                replies.append((self._evaluate(self._opponent_workers, self._workers), reply))
+            board.unmake_move(undo_token)
+        replies = [reply for _, reply in sorted(replies, key=lambda scored: scored[0], reverse=True)[:self._ponder_replies]]
+
+        self._table.new_search()
+        self._killers = [[None, None] for depth in range(self._max_depth + 1)]
+        self._history = {}
+        for depth in range(1, self._max_depth + 1):
+            for reply in replies:
+                if stop.is_set():
+                    return
+                undo_token = board.make_move(reply)
+                try:
+                    key = board.zobrist_key
+                    previous = pondered.get(key)
+                    if previous is not None and abs(previous[1]) >= self.WIN_SCORE:
+                        continue
+                    actions = list(board.actions(self._workers))
+                    if previous is not None:
+                        # search the previous best first so this iteration cuts off sooner
+                        actions.remove(previous[2])
+                        actions.insert(0, previous[2])
+                    score, action = self._search_root(actions, depth)
+                    pondered[key] = (depth, score, action)
+                except _SearchTimeout:
+                    return
+                finally:
+                    board.unmake_move(undo_token)
+
+    def search_scores(self):
+        """
+        Searches in this process and returns (depth, score, best action) for every depth
+        completed before the time budget ran out
+        """
+        return self._deepen(self._board.actions(self._workers))
+
+    def _deepen(self, actions, deadline=None):
+        """
+        Iterative deepening driver over the given root turns. Returns (depth, score, best action)
+        for every depth completed before the deadline, a time.time() value, which by default
+        is the time budget from now.
+        """
+        self._deadline = deadline if deadline is not None else time.time() + self._time_limit
+        self._table.new_search()
+        self._killers = [[None, None] for depth in range(self._max_depth + 1)]
+        self._history = {}
+        actions = list(actions)
+        results = []
+        for depth in range(1, self._max_depth + 1):
+            try:
+                score, action = self._search_root(actions, depth)
+            except _SearchTimeout:
+                break
+            results.append((depth, score, action))
+            if abs(score) >= self.WIN_SCORE:
+                break
+            # search the previous best first so the next iteration cuts off sooner
+            actions.remove(action)
+            actions.insert(0, action)
+        return results
+
+    def _parallel_search(self, actions):
+        """
+        Deals the root turns out to the search processes, which all stop at the same deadline.
+        A forced win from any share is played; otherwise the best score at the deepest depth that
+        every unproven share completed wins. A share that proved all its turns lose stopped
+        deepening, and its last result stands at every deeper depth.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._processes)
+        shares = [actions[i::self._processes] for i in range(self._processes)]
+        heights = self._board.get_heights()
+        worker_squares = self._board.get_worker_squares()
+        shape = (self._board.rows, self._board.cols, len(self._workers))
+        # an absolute deadline, so time spent starting processes and sending work counts
+        deadline = time.time() + self._time_limit
+        futures = [self._executor.submit(_search_share, self._id, shape, heights, worker_squares, share, deadline, self._max_depth)
+                   for share in shares if share]
+        results = [future.result() for future in futures]
+        for share_results in results:
+            if share_results and share_results[-1][1] >= self.WIN_SCORE:
+                return share_results[-1][2]
+        unproven = [share_results for share_results in results
+                    if not share_results or abs(share_results[-1][1]) < self.WIN_SCORE]
+        if unproven:
+            depth = min(len(share_results) for share_results in unproven)
+        else:
+            depth = max(len(share_results) for share_results in results)
+        if depth == 0:
+            return actions[0]
+        return max((share_results[min(depth, len(share_results)) - 1] for share_results in results),
+                   key=lambda result: result[1])[2]
+
+    def close(self):
+        """
+        Stops pondering and shuts down the search processes
+        """
+        self.stop_pondering()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _search_root(self, actions, depth):
+        alpha = -self.WIN_SCORE - self._max_depth - 1
+        beta = -alpha
+        best_action = actions[0]
+        for action in actions:
+            score = self._score_action(action, self._workers, self._opponent_workers, depth, alpha, beta)
+            if score > alpha:
+                alpha = score
+                best_action = action
+        return alpha, best_action
+
+    def _score_action(self, action, workers, opponent_workers, depth, alpha, beta):
+        undo_token = self._board.make_move(action)
+        try:
+            if self._board.get_worker_height(action[0]) == 3:
+                return self.WIN_SCORE + depth
+            return -self._negamax(opponent_workers, workers, depth - 1, -beta, -alpha)
+        finally:
+            self._board.unmake_move(undo_token)
+
+    def _negamax(self, workers, opponent_workers, depth, alpha, beta):
+        if time.time() > self._deadline:
+            raise _SearchTimeout()
+        key = self._board.zobrist_key
+        if workers is self._worker_list[1]:
+            key ^= ZOBRIST_SIDE
+        entry = self._table.probe(key)
+        best_move = None
+        if entry is not None:
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score
+                if entry.flag == LOWER_BOUND and entry.score >= beta:
+                    return entry.score
+                if entry.flag == UPPER_BOUND and entry.score <= alpha:
+                    return entry.score
+            best_move = entry.best_move
+        if depth == 0:
+            if not any(self._board.is_possible_next_turn(w) for w in workers):
+                return -self.WIN_SCORE - depth
+            return self._evaluate(workers, opponent_workers)
+        actions = self._board.actions(workers, self._killers[depth], self._history)
+        if best_move is not None and best_move[0] in workers and self._board.valid_action(best_move):
+            actions = itertools.chain((best_move,), (action for action in actions if action != best_move))
+        original_alpha = alpha
+        best_score = None
+        for action in actions:
+            score = self._score_action(action, workers, opponent_workers, depth, alpha, beta)
+            if best_score is None or score > best_score:
+                best_score = score
+                best_move = action
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._remember_cutoff(action, depth)
+                break
+        if best_score is None:
+            return -self.WIN_SCORE - depth
+        if best_score >= beta:
+            flag = LOWER_BOUND
+        elif best_score <= original_alpha:
+            flag = UPPER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, flag, best_score, best_move)
+        return best_score
+
+    def _remember_cutoff(self, action, depth):
+        """
+        Records a turn that caused a cutoff as a killer at this depth and in the history table
+        """
+        killers = self._killers[depth]
+        if killers[0] != action:
+            killers[1] = killers[0]
+            killers[0] = action
+        bonus = depth * depth
+        self._history[action[:2]] = self._history.get(action[:2], 0) + bonus
+        self._history[action] = self._history.get(action, 0) + bonus
+
+class _TreeNode():
+    """
+    A node of the MCTS tree: the position reached by playing action, with the given workers to move.
+    Wins are counted for the side that played the action.
+    """
+    def __init__(self, parent, action, workers, key, winner=None):
+        self.parent = parent
+        self.action = action
+        self.workers = workers
+        self.key = key
+        self.winner = winner
+        self.untried = None
+        self.children = []
+        self.visits = 0
+        self.wins = 0.0
+
+    def uct_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_visits / c.visits))
+
+class MCTSPlayer(Player):
+    """
+    Concrete class for a Monte Carlo tree search player. Selects full turns with UCT and scores
+    new nodes by playing random games out to the end. Searches for a number of iterations or, if
+    none is given, until its per-move time budget runs out, and keeps the subtree of the position
+    actually reached for its next turn.
+    """
+    def __init__(self, id, board, rng=None, iterations=None, time_limit=1.0, exploration=1.4, heuristic_rollouts=True):
+        super().__init__(id, board, rng)
+        self._opponent_workers = self._worker_list[1 - self._worker_list.index(self._workers)]
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._exploration = exploration
+        self._heuristic_rollouts = heuristic_rollouts
+        self._root = None
+        self._result = None
+
+    def select_worker(self):
+        """
+        Searches for the most visited full turn and selects its worker
+        """
+        self._result = self._search()
+        return self._result[0]
+
+    def select_move_direction(self, worker):
+        """
+        Selects the move of the most visited full turn
+        """
+        return self._result[1]
+
+    def select_build_direction(self, worker):
+        """
+        Selects the build of the most visited full turn
+        """
+        return self._result[2]
+
+    def _other(self, workers):
+        return self._opponent_workers if workers is self._workers else self._workers
+
+    def _reuse_root(self):
+        """
+        Finds the current position among the grandchildren of the previous root (our move, then
+        the opponent's reply). Falls back to a fresh tree if it is not there.
+        """
+        key = self._board.zobrist_key
+        if self._root is not None:
+            if self._root.key == key and self._root.workers is self._workers:
+                return self._root
+            for child in self._root.children:
+                if child.key == key and child.workers is self._workers:
+                    child.parent = None
+                    return child
+        return _TreeNode(None, None, self._workers, key)
+
+    def _search(self):
+        known_action = self._book_action() or self._solved_action()
+        if known_action is not None:
+            self._root = None
+            return known_action
+        root = self._reuse_root()
+        deadline = time.perf_counter() + self._time_limit
+        iterations = 0
+        while (iterations < self._iterations) if self._iterations is not None else (time.perf_counter() < deadline or iterations == 0):
+            self._iterate(root)
+            iterations += 1
+        best = max(root.children, key=lambda c: c.visits)
+        # keep the subtree below our move; the opponent's reply picks the next root from it
+        best.parent = None
+        self._root = best
+        return best.action
+
+    def _iterate(self, root):
+        node = root
+        undo_tokens = []
+        while node.winner is None and node.untried is not None and not node.untried:
+            node = node.uct_child(self._exploration)
+            undo_tokens.append(self._board.make_move(node.action))
+        if node.winner is None:
+            if node.untried is None:
+                node.untried = self._board.action_list(node.workers)
+                self._rng.shuffle(node.untried)
+                if not node.untried:
+                    node.winner = self._other(node.workers)
+            if node.untried:
+                action = node.untried.pop()
+                undo_tokens.append(self._board.make_move(action))
+                winner = node.workers if self._board.get_worker_height(action[0]) == 3 else None
+                child = _TreeNode(node, action, self._other(node.workers), self._board.zobrist_key, winner)
+                node.children.append(child)
+                node = child
+        winner = node.winner if node.winner is not None else self._rollout(node.workers)
+        for undo_token in reversed(undo_tokens):
+            self._board.unmake_move(undo_token)
+        while node is not None:
+            node.visits += 1
+            if winner is not node.workers:
+                node.wins += 1
+            node = node.parent
+
+    def _rollout(self, workers):
+        """
+        Plays random turns to the end of the game from the current position and returns the
+        winning workers. Heuristic rollouts always take a winning climb and otherwise move as high
+        as they can; builds are chosen at random like Player.select_build_direction.
+        """
+        undo_tokens = []
+        try:
+            while True:
+                moves = [(w, m) for w in workers for m in self._board.move_list(w)]
+                if not moves:
+                    return self._other(workers)
+                if self._heuristic_rollouts:
+                    heights = [self._board.move_height(w, m) for w, m in moves]
+                    top = max(heights)
+                    moves = [move for move, height in zip(moves, heights) if height == top]
+                w, m = self._rng.choice(moves)
+                undo_token = self._board.make_move((w, m, None))
+                if self._board.get_worker_height(w) == 3:
+                    undo_tokens.append(undo_token)
+                    return workers
+                b = self._rng.choice(self._board.build_list(w))
+                self._board.unmake_move(undo_token)
+                undo_tokens.append(self._board.make_move((w, m, b)))
+                workers = self._other(workers)
+        finally:
+            for undo_token in reversed(undo_tokens):
+                self._board.unmake_move(undo_token)
+
 class HumanPlayer(Player):
     """
     Concrete class for the human player. It takes in user input.
     """
-    def __init__(self, id, board):
-        super().__init__(id, board)
+    def __init__(self, id, board, rng=None):
+        super().__init__(id, board, rng)
+
+    def worker_error(self, worker):
+        """
+        Returns why a worker cannot be selected, or None if it can
+        """
+        if worker not in "".join(self._worker_list[0] + self._worker_list[1]):
+            return "Not a valid worker"
+        elif worker not in self._workers:
+            return "That is not your worker"
+        return None
+
+    def move_error(self, worker, move_direction):
+        """
+        Returns why a worker cannot move in a direction, or None if it can
+        """
+        if not self._board.valid_direction(move_direction):
+            return "Not a valid direction"
+        elif not self._board.valid_move(worker, move_direction):
+            return f"Cannot move {move_direction}"
+        return None
+
+    def build_error(self, worker, build_direction):
+        """
+        Returns why a worker cannot build in a direction, or None if it can
+        """
+        if not self._board.valid_direction(build_direction):
+            return "Not a valid direction"
+        elif not self._board.valid_build(worker, build_direction):
+            return f"Cannot build {build_direction}"
+        return None
 
     def select_worker(self):
         """
@@ -170,10 +709,9 @@ class HumanPlayer(Player):
         while not flag:
             print("Select a worker to move")
             worker = input()
-            if worker not in "ABYZ":
-                print("Not a valid worker")
-            elif worker not in self._workers:
-                print("That is not your worker")
+            error = self.worker_error(worker)
+            if error:
+                print(error)
             else:
                 flag = True
         return worker
@@ -186,10 +724,9 @@ class HumanPlayer(Player):
         while not flag:
             print("Select a direction to move (n, ne, e, se, s, sw, w, nw)")
             move_direction = input()
-            if not self._board.valid_direction(move_direction):
-                print("Not a valid direction")
-            elif not self._board.valid_move(worker, move_direction):
-                print(f"Cannot move {move_direction}")
+            error = self.move_error(worker, move_direction)
+            if error:
+                print(error)
             else:
                 flag = True
         return move_direction
@@ -202,12 +739,9 @@ class HumanPlayer(Player):
         while not flag:
             print("Select a direction to build (n, ne, e, se, s, sw, w, nw)")
             build_direction = input()
-            if not self._board.valid_direction(build_direction):
-                print("Not a valid direction")
-            elif not self._board.valid_build(worker, build_direction):
-                print(f"Cannot build {build_direction}")
+            error = self.build_error(worker, build_direction)
+            if error:
+                print(error)
             else:
                 flag = True
         return build_direction
-
-
@@ -1,17 +1,23 @@
-from player import RandomPlayer, HumanPlayer, HeuristicPlayer
+from player import RandomPlayer, HumanPlayer, HeuristicPlayer, MinimaxPlayer, MCTSPlayer
+
+PLAYER_TYPES = ['human', 'heuristic', 'random', 'minimax', 'mcts']
 
 class PlayerFactory():
     """
     Establishes a class to handle the creation of players
     """
-    def create_player(self, id, type, board):
+    def create_player(self, id, type, board, rng=None):
         if type == 'human':
-            return HumanPlayer(id, board)
+            return HumanPlayer(id, board, rng)
         elif type == 'random':
-            return RandomPlayer(id, board)
+            return RandomPlayer(id, board, rng)
+        elif type == 'minimax':
+            return MinimaxPlayer(id, board, rng)
+        elif type == 'mcts':
+            return MCTSPlayer(id, board, rng)
         else:
-            return HeuristicPlayer(id, board)
+            return HeuristicPlayer(id, board, rng)
         
 def make_player(player_type, *args):
     factory = PlayerFactory()
-    return factory.create_player(player_type, *args)
\ No newline at end of file
+    return factory.create_player(player_type, *args)
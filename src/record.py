@@ -0,0 +1,122 @@
+import struct
+from board import SantoriniBoard, DIRECTIONS, SIDES
+from player_factory import PLAYER_TYPES
+
+# A record file is the magic bytes followed by games. Each game is a fixed header (white type,
+# blue type, seed, winner, number of turns) and then one byte per turn: the worker of the side to
+# move in bit 6, the move direction in bits 3-5 and the build direction in bits 0-2.
+MAGIC = b'SNTR\x01'
+GAME_HEADER = struct.Struct('<BBQBH')
+NO_WINNER = 0xff
+
+DIRECTION_NAMES = list(DIRECTIONS)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTION_NAMES)}
+
+def encode_turn(side, worker, move_dir, build_dir):
+    """
+    Packs a turn into one byte
+    """
+    return SIDES[side].index(worker) << 6 | DIRECTION_CODES[move_dir] << 3 | DIRECTION_CODES[build_dir]
+
+def decode_turn(side, code):
+    """
+    Unpacks a turn byte into (worker, move direction, build direction)
+    """
+    return SIDES[side][code >> 6 & 1], DIRECTION_NAMES[code >> 3 & 7], DIRECTION_NAMES[code & 7]
+
+class GameRecord():
+    """
+    One stored game: the player types, seed, winner (None if unfinished) and packed turns
+    """
+    def __init__(self, p1, p2, seed, winner, turns):
+        self.p1 = p1
+        self.p2 = p2
+        self.seed = seed
+        self.winner = winner
+        self.turns = turns
+
+    def __len__(self):
+        return len(self.turns)
+
+    def actions(self):
+        """
+        Yields the (worker, move direction, build direction) of every turn
+        """
+        for index, code in enumerate(self.turns):
+            yield decode_turn(index % 2, code)
+
+    def replay(self, board=None):
+        """
+        Plays the game through a board, yielding the board after each turn along with the
+        action that led to it. The same board object is updated and yielded every time.
+        """
+        board = board if board is not None else SantoriniBoard()
+        for action in self.actions():
+            board.make_move(action)
+            yield board, action
+
+class RecordWriter():
+    """
+    Streams games to a record file. Turns of the current game are kept in memory with a cursor so
+    undo and redo move back and forth in them; the game is written out when it ends.
+    """
+    def __init__(self, path, mode='wb'):
+        self._file = open(path, mode)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._header = None
+        self._turns = bytearray()
+        self._cursor = 0
+
+    def start_game(self, p1, p2, seed=None):
+        self._header = (PLAYER_TYPES.index(p1), PLAYER_TYPES.index(p2), seed or 0)
+        self._turns = bytearray()
+        self._cursor = 0
+
+    def record_turn(self, worker, move_dir, build_dir):
+        """
+        Adds a turn after the cursor, dropping any turns that were undone
+        """
+        del self._turns[self._cursor:]
+        self._turns.append(encode_turn(self._cursor % 2, worker, move_dir, build_dir))
+        self._cursor += 1
+
+    def seek(self, turns):
+        """
+        Moves the cursor after an undo or redo so that only the first turns count
+        """
+        self._cursor = turns
+
+    def end_game(self, winner):
+        p1, p2, seed = self._header
+        turns = self._turns[:self._cursor]
+        self._file.write(GAME_HEADER.pack(p1, p2, seed, NO_WINNER if winner is None else winner, len(turns)))
+        self._file.write(turns)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_games(path):
+    """
+    Yields the games of a record file one at a time, reading only as much of the file as needed
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a game record file")
+        while True:
+            header = file.read(GAME_HEADER.size)
+            if not header:
+                return
+            if len(header) < GAME_HEADER.size:
+                raise ValueError(f"{path} ends in the middle of a game header")
+            p1, p2, seed, winner, count = GAME_HEADER.unpack(header)
+            turns = file.read(count)
+            if len(turns) < count:
+                raise ValueError(f"{path} ends in the middle of a game")
+            yield GameRecord(PLAYER_TYPES[p1], PLAYER_TYPES[p2], seed, None if winner == NO_WINNER else winner, turns)
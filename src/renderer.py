@@ -0,0 +1,104 @@
+import shutil
+import sys
+
+RENDERER_TYPES = ['text', 'ansi', 'null']
+
+def cells(board):
+    """
+    Returns the text of every square, row by row: its height and the letter of the worker
+    standing on it, or a space
+    """
+    occupant = {square: w for w, square in board.get_worker_squares().items()}
+    return [f"{height}{occupant.get(square, ' ')}" for square, height in enumerate(board.get_heights())]
+
+def frame(board, board_cells=None):
+    """
+    Returns the board as text in the format of the spec, built in one buffer
+    """
+    if board_cells is None:
+        board_cells = cells(board)
+    cols = board.cols
+    horizontal_border = '+' + '--+' * cols
+    lines = [horizontal_border]
+    for start in range(0, len(board_cells), cols):
+        lines.append("|" + "|".join(board_cells[start:start + cols]) + "|")
+        lines.append(horizontal_border)
+    return "\n".join(lines)
+
+class NullRenderer():
+    """
+    Renderer for headless runs: draws and writes nothing
+    """
+    def draw(self, board):
+        pass
+
+    def line(self, text):
+        pass
+
+    def close(self):
+        pass
+
+class TextRenderer(NullRenderer):
+    """
+    Writes every frame and line of game output to a stream, each with a single write
+    """
+    def __init__(self, stream=None):
+        self._stream = stream if stream is not None else sys.stdout
+
+    def draw(self, board):
+        self._stream.write(frame(board) + "\n")
+        self._stream.flush()
+
+    def line(self, text):
+        self._stream.write(text + "\n")
+        self._stream.flush()
+
+class AnsiRenderer(TextRenderer):
+    """
+    Keeps the board at the top of the terminal and redraws only the squares that changed since
+    the last frame, using ANSI cursor positioning. Lines of output scroll in a region below the
+    board. close() gives the whole terminal back.
+    """
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._cells = None
+        self._lines = None
+
+    def draw(self, board):
+        board_cells = cells(board)
+        if self._cells is None or len(board_cells) != len(self._cells):
+            frame_lines = 2 * board.rows + 1
+            self._lines = shutil.get_terminal_size().lines
+            # clear the screen, draw the whole board, then scroll only the lines below it
+            self._stream.write(f"\x1b[2J\x1b[H{frame(board, board_cells)}\x1b[{frame_lines + 1};{self._lines}r\x1b[{frame_lines + 1};1H")
+        else:
+            cols = board.cols
+            # save the cursor, rewrite each changed cell where the full frame put it, restore it
+            buffer = ["\x1b7"]
+            for square, (old, new) in enumerate(zip(self._cells, board_cells)):
+                if old != new:
+                    row, col = divmod(square, cols)
+                    buffer.append(f"\x1b[{2 * row + 2};{3 * col + 2}H{new}")
+            buffer.append("\x1b8")
+            if len(buffer) > 2:
+                self._stream.write("".join(buffer))
+        self._cells = board_cells
+        self._stream.flush()
+
+    def close(self):
+        if self._cells is not None:
+            self._stream.write(f"\x1b[r\x1b[{self._lines};1H\n")
+            self._stream.flush()
+            self._cells = None
+
+def make_renderer(type):
+    """
+    Returns a renderer given its name in RENDERER_TYPES
+    """
+    if type == 'text':
+        return TextRenderer()
+    elif type == 'ansi':
+        return AnsiRenderer()
+    elif type == 'null':
+        return NullRenderer()
+    raise ValueError(f"unknown renderer {type}")
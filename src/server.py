@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import collections
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import SantoriniBoard
+from game import Game
+from player import HumanPlayer
+from player_factory import PLAYER_TYPES, make_player
+
+USAGE = "new <white> <blue> [undo on|off] [score on|off], stats or quit"
+
+def ai_turn(player_type, shape, heights, worker_squares, side):
+    """
+    Runs in an AI process: sets up the position, lets a fresh player of the given type choose a
+    full turn for side and returns it as (worker, move, build). shape is the board's (rows, cols,
+    workers per side).
+    """
+    board = SantoriniBoard(*shape)
+    board.set_position(heights, worker_squares)
+    player = make_player(side, player_type, board)
+    worker = player.select_worker()
+    move_dir = player.select_move_direction(worker)
+    undo_token = board.make_move((worker, move_dir, None))
+    build_dir = player.select_build_direction(worker)
+    board.unmake_move(undo_token)
+    return worker, move_dir, build_dir
+
+class _Disconnected(Exception):
+    """
+    Raised when a client closes its connection in the middle of a session
+    """
+
+class ServerMetrics():
+    """
+    Counts sessions and keeps the latency of recent AI turns, measured from the moment a turn is
+    handed to the executor until its result is back on the event loop
+    """
+    def __init__(self, window=1024):
+        self.active = 0
+        self.peak = 0
+        self.sessions = 0
+        self.games = 0
+        self.turns = 0
+        self._latencies = collections.deque(maxlen=window)
+
+    def session_started(self):
+        self.sessions += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+    def session_ended(self):
+        self.active -= 1
+
+    def record_turn(self, seconds):
+        self.turns += 1
+        self._latencies.append(seconds)
+
+    def latency(self):
+        """
+        Returns (mean, 95th percentile, max) seconds over the recent AI turns
+        """
+        if not self._latencies:
+            return 0.0, 0.0, 0.0
+        latencies = sorted(self._latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return sum(latencies) / len(latencies), p95, latencies[-1]
+
+    def __str__(self):
+        mean, p95, worst = self.latency()
+        return (f"sessions: {self.active} active, {self.peak} peak, {self.sessions} total; "
+                f"games: {self.games}; AI turns: {self.turns}, "
+                f"latency mean {mean * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms, max {worst * 1000:.1f} ms")
+
+class Session():
+    """
+    One client connection. It speaks the console game's lines and commands, so a client sees
+    the same board, prompts and errors as a player at the terminal.
+    """
+    def __init__(self, reader, writer, executor, metrics):
+        self._reader = reader
+        self._writer = writer
+        self._executor = executor
+        self._metrics = metrics
+
+    async def _send(self, text):
+        self._writer.write((text + "\n").encode())
+        await self._writer.drain()
+
+    async def _ask(self, prompt):
+        await self._send(prompt)
+        line = await self._reader.readline()
+        if not line:
+            raise _Disconnected()
+        return line.decode().strip()
+
+    async def run(self):
+        self._metrics.session_started()
+        try:
+            while True:
+                command = (await self._ask(USAGE)).split()
+                if not command:
+                    continue
+                if command[0] == "quit":
+                    break
+                elif command[0] == "stats":
+                    await self._send(str(self._metrics))
+                elif command[0] == "new":
+                    args = self._parse_new(command[1:])
+                    if args is None:
+                        await self._send("Invalid Argument")
+                    else:
+                        await self.play_game(*args)
+                else:
+                    await self._send("Invalid Argument")
+        except (_Disconnected, ConnectionError):
+            pass
+        finally:
+            self._metrics.session_ended()
+            self._writer.close()
+
+    def _parse_new(self, args):
+        """
+        Checks the arguments of a new command the way main.py checks its command line
+        """
+        valid_args = [PLAYER_TYPES, PLAYER_TYPES, ['on', 'off'], ['on', 'off']]
+        if len(args) < 2 or len(args) > 4:
+            return None
+        parsed = ["human", "human", "off", "off"]
+        for x, arg in enumerate(args):
+            if arg not in valid_args[x]:
+                return None
+            parsed[x] = arg
+        if parsed[0] != 'human' and parsed[1] != 'human':
+            parsed[2] = 'off'
+        return parsed[0], parsed[1], parsed[2] == "on", parsed[3] == "on"
+
+    async def play_game(self, p1, p2, enable_undo, enable_score):
+        """
+        Plays a game with the client, following Game.play_game step by step
+        """
+        game = Game(p1, p2, enable_undo, enable_score, verbose=False)
+        player_types = (p1, p2)
+        self._metrics.games += 1
+        while True:
+            await self._send(game.board.render())
+            await self._send(game.turn_header())
+
+            choice = None
+            if enable_undo:
+                choice = await self._ask("undo, redo, or next")
+
+            if choice == "undo":
+                game.undo()
+            elif choice == "redo":
+                game.redo()
+            else:
+                winner = game.winner()
+                if winner is not None:
+                    await self._send(f"{game.player(winner).color} has won")
+                    game.end_game(winner)
+                    return winner
+                player = game.current_player()
+                if isinstance(player, HumanPlayer):
+                    turn = await self._human_turn(game, player)
+                else:
+                    board = game.board
+                    side = (game.turn_num - 1) % 2
+                    shape = (board.rows, board.cols, len(board.sides[0]))
+                    start = time.perf_counter()
+                    turn = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, ai_turn, player_types[side], shape, board.get_heights(), board.get_worker_squares(), side)
+                    self._metrics.record_turn(time.perf_counter() - start)
+                await self._send(game.play_turn(*turn))
+
+    async def _human_turn(self, game, player):
+        """
+        Asks the client for a full turn with the same prompts and checks as HumanPlayer
+        """
+        board = game.board
+        while True:
+            while True:
+                worker = await self._ask("Select a worker to move")
+                error = player.worker_error(worker)
+                if error is None:
+                    break
+                await self._send(error)
+            if board.is_possible_next_turn(worker):
+                break
+            await self._send("That worker cannot move")
+
+        while True:
+            move_dir = await self._ask("Select a direction to move (n, ne, e, se, s, sw, w, nw)")
+            error = player.move_error(worker, move_dir)
+            if error is None:
+                break
+            await self._send(error)
+
+        undo_token = board.make_move((worker, move_dir, None))
+        try:
+            while True:
+                build_dir = await self._ask("Select a direction to build (n, ne, e, se, s, sw, w, nw)")
+                error = player.build_error(worker, build_dir)
+                if error is None:
+                    break
+                await self._send(error)
+        finally:
+            board.unmake_move(undo_token)
+        return worker, move_dir, build_dir
+
+async def start_server(host="127.0.0.1", port=3270, metrics=None, executor=None):
+    """
+    Starts serving games and returns (asyncio server, metrics). AI turns run in a pool of
+    processes, by default one per core, so searches for different sessions run in parallel and
+    the event loop stays free to serve every other session. Only the position goes to a
+    process and only the chosen turn comes back; each process keeps its own tablebase and
+    opening book.
+    """
+    if metrics is None:
+        metrics = ServerMetrics()
+    if executor is None:
+        executor = ProcessPoolExecutor()
+
+    async def handle(reader, writer):
+        await Session(reader, writer, executor, metrics).run()
+
+    server = await asyncio.start_server(handle, host, port)
+    return server, metrics
+
+async def report(metrics, interval):
+    while True:
+        await asyncio.sleep(interval)
+        print(metrics, flush=True)
+
+async def serve(host, port, report_interval, processes):
+    executor = ProcessPoolExecutor(processes)
+    server, metrics = await start_server(host, port, executor=executor)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"serving Santorini on {addresses}", flush=True)
+    reporter = asyncio.create_task(report(metrics, report_interval)) if report_interval > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        executor.shutdown(cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hosts many concurrent Santorini games over a line-based TCP protocol")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=3270)
+    parser.add_argument('--report-interval', type=float, default=60.0, help="seconds between metrics reports, 0 for none")
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help="processes for AI turns")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.report_interval, args.processes))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import random
+import time
+import instrument
+from game import Game
+from player_factory import PLAYER_TYPES
+from record import RecordWriter
+from renderer import RENDERER_TYPES, NullRenderer, make_renderer
+
+AI_PLAYER_TYPES = [t for t in PLAYER_TYPES if t != 'human']
+
+def game_seed(seed, index):
+    """
+    Returns the 64-bit seed for one game of a run. It depends only on the run's seed and the
+    game's index, so any game can be reproduced on its own.
+    """
+    return random.Random(f"{seed}:{index}").getrandbits(64)
+
+def play_headless(p1, p2, seed, recorder=None, size=5, workers_per_side=2, renderer=None):
+    """
+    Plays one game with no terminal input and returns (winner id, number of turns played). The
+    game is only shown if a renderer is given.
+    """
+    if renderer is None:
+        renderer = NullRenderer()
+    game = Game(p1, p2, False, False, seed=seed, recorder=recorder, size=size, workers_per_side=workers_per_side, renderer=renderer)
+    winner = game.play_game()
+    return winner, game.turn_num - 1
+
+def simulate(p1, p2, games, seed=0, recorder=None, report=None, size=5, workers_per_side=2, renderer=None):
+    """
+    Plays a batch of games and returns the white and blue win counts, total turns and elapsed
+    seconds. If given, report is called with (game index, winner id, turns) after each game.
+    """
+    wins = [0, 0]
+    turns = 0
+    start = time.perf_counter()
+    for index in range(games):
+        winner, length = play_headless(p1, p2, game_seed(seed, index), recorder, size, workers_per_side, renderer)
+        wins[winner] += 1
+        turns += length
+        if report is not None:
+            report(index, winner, length)
+    return wins, turns, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plays AI-vs-AI Santorini games without any terminal I/O")
+    parser.add_argument('--p1', choices=AI_PLAYER_TYPES, default='heuristic', help="white player type")
+    parser.add_argument('--p2', choices=AI_PLAYER_TYPES, default='random', help="blue player type")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', metavar='PATH', help="append every game to a game record file")
+    parser.add_argument('--size', type=int, default=5, help="play on a size x size board")
+    parser.add_argument('--workers', type=int, default=2, help="workers per side")
+    parser.add_argument('--render', choices=RENDERER_TYPES, default='null', help="show the games as they are played")
+    parser.add_argument('--profile', action='store_true', help="count and time board calls and player decisions (also enabled by SANTORINI_PROFILE=1)")
+    parser.add_argument('--profile-games', action='store_true', help="with profiling, also print a summary line for every game")
+    parser.add_argument('--cprofile', metavar='PATH', help="write cProfile stats for the whole run to PATH")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.record and (args.size != 5 or args.workers != 2):
+        parser.error("--record only supports the 5x5 game with two workers per side")
+
+    if args.profile:
+        instrument.enable()
+    profiling = instrument.enable_from_environment()
+    batch = instrument.Profile()
+
+    def report(index, winner, length):
+        game_profile = instrument.take()
+        batch.merge(game_profile)
+        if args.profile_games:
+            print(f"game {index}: {['white', 'blue'][winner]} won in {length} turns, {game_profile.brief()}")
+
+    renderer = make_renderer(args.render)
+
+    def run(recorder=None):
+        try:
+            return simulate(args.p1, args.p2, args.games, args.seed, recorder, report if profiling else None,
+                            args.size, args.workers, renderer)
+        finally:
+            renderer.close()
+
+    stats = None
+    if args.record:
+        with RecordWriter(args.record, 'ab') as recorder:
+            if args.cprofile:
+                (wins, turns, elapsed), stats = instrument.profiled(run, args.cprofile, recorder)
+            else:
+                wins, turns, elapsed = run(recorder)
+    elif args.cprofile:
+        (wins, turns, elapsed), stats = instrument.profiled(run, args.cprofile)
+    else:
+        wins, turns, elapsed = run()
+    print(f"white ({args.p1}) wins: {wins[0]} ({wins[0] / args.games:.1%})")
+    print(f"blue ({args.p2}) wins: {wins[1]} ({wins[1] / args.games:.1%})")
+    print(f"average game length: {turns / args.games:.2f} turns")
+    print(f"{args.games / elapsed:.1f} games/s ({elapsed:.2f} s)")
+    if profiling:
+        print(batch.summary(f"{args.games} games"))
+    if stats is not None:
+        stats.sort_stats('cumulative').print_stats(20)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from board import DIRECTIONS, SIDES
+
+# The 8 symmetries of the 5x5 board as functions of (row, col): the identity, the three rotations,
+# and the reflections in the vertical, horizontal and both diagonal axes
+_TRANSFORMS = (
+    lambda r, c: (r, c),
+    lambda r, c: (c, 4 - r),
+    lambda r, c: (4 - r, 4 - c),
+    lambda r, c: (4 - c, r),
+    lambda r, c: (r, 4 - c),
+    lambda r, c: (4 - r, c),
+    lambda r, c: (c, r),
+    lambda r, c: (4 - c, 4 - r),
+)
+
+# SQUARE_MAPS[t][square] is where symmetry t sends a square and GATHER[t][square] is the square
+# it comes from, so GATHER[t] reorders a height array into its transformed layout
+SQUARE_MAPS = tuple(tuple(r * 5 + c for r, c in (f(s // 5, s % 5) for s in range(25))) for f in _TRANSFORMS)
+GATHER = tuple(tuple(sorted(range(25), key=lambda s: square_map[s])) for square_map in SQUARE_MAPS)
+INVERSE = tuple(next(u for u in range(8) if all(SQUARE_MAPS[u][SQUARE_MAPS[t][s]] == s for s in range(25))) for t in range(8))
+
+def _direction_map(f):
+    # a symmetry moves a step from the centre the same way it moves the direction
+    r0, c0 = f(2, 2)
+    by_offset = {offset: direction for direction, offset in DIRECTIONS.items()}
+    mapped = {}
+    for direction, (d_row, d_col) in DIRECTIONS.items():
+        r, c = f(2 + d_row, 2 + d_col)
+        mapped[direction] = by_offset[(r - r0, c - c0)]
+    return mapped
+
+DIRECTION_MAPS = tuple(_direction_map(f) for f in _TRANSFORMS)
+
+def canonical_form(board, side):
+    """
+    Returns (key, t): the smallest key over the 8 board symmetries and the symmetry t that gives
+    it. Each colour's worker squares are stored as an unordered pair, so swapping A and B or Y
+    and Z gives the same key too. Equivalent positions therefore all share one key.
+    """
+    squares = board.get_worker_squares()
+    white = (squares[SIDES[0][0]], squares[SIDES[0][1]])
+    blue = (squares[SIDES[1][0]], squares[SIDES[1][1]])
+    # the worker squares lead the key, so only symmetries tied on them need their heights compared
+    best = None
+    tied = []
+    for t, square_map in enumerate(SQUARE_MAPS):
+        workers = sorted((square_map[white[0]], square_map[white[1]])) + sorted((square_map[blue[0]], square_map[blue[1]]))
+        if best is None or workers < best:
+            best = workers
+            tied = [t]
+        elif workers == best:
+            tied.append(t)
+    heights = board.get_heights()
+    prefix = bytes(best + [side])
+    return min((prefix + bytes(map(heights.__getitem__, GATHER[t])), t) for t in tied)
+
+def canonical_key(board, side):
+    """
+    Returns the key shared by all positions equivalent to this one
+    """
+    return canonical_form(board, side)[0]
+
+def encode_action(board, action, t):
+    """
+    Expresses a full turn in the frame of symmetry t as (from square, move, build), naming the
+    worker by its square since workers of one colour are interchangeable there
+    """
+    w, move_dir, build_dir = action
+    return SQUARE_MAPS[t][board.get_worker_squares()[w]], DIRECTION_MAPS[t][move_dir], DIRECTION_MAPS[t][build_dir]
+
+def decode_action(board, encoded, t):
+    """
+    Turns an action encoded in the frame of symmetry t back into a (worker, move, build) turn on
+    the board, or returns None if no worker stands on its square
+    """
+    square, move_dir, build_dir = encoded
+    inverse = INVERSE[t]
+    square = SQUARE_MAPS[inverse][square]
+    for w, worker_square in board.get_worker_squares().items():
+        if worker_square == square:
+            return w, DIRECTION_MAPS[inverse][move_dir], DIRECTION_MAPS[inverse][build_dir]
+    return None
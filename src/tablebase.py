@@ -0,0 +1,196 @@
+import argparse
+import os
+import sqlite3
+from board import SIDES
+from symmetry import canonical_key
+
+WIN = 1
+LOSS = -1
+
+class _Unsolved(Exception):
+    """
+    Raised when a position needs more nodes than the solver is allowed
+    """
+
+def position_key(board, side):
+    """
+    Returns the byte string results are stored under. Symmetric positions share one key, so
+    each is solved and stored once.
+    """
+    return canonical_key(board, side)
+
+class Tablebase():
+    """
+    Exhaustive solver for late-game positions with a cache of solved results. Positions where the
+    side to move has at most max_actions full turns are solved to the end of the game, giving up
+    after node_limit positions. Results are kept in memory and, when a path is given, also in an
+    on-disk SQLite key-value table; with writable False that store is only read. A result is the
+    outcome for the side to move and the number of turns to the end of the game with best play:
+    the quickest win, or the longest resistance to a loss.
+    """
+    def __init__(self, path=None, writable=True, max_actions=16, node_limit=2000, memo_limit=1 << 20):
+        self._memo = {}
+        self._memo_limit = memo_limit
+        self._failed = set()
+        self._store = None
+        self._writable = writable
+        if path is not None and (writable or os.path.exists(path)):
+            if writable:
+                self._store = sqlite3.connect(path)
+                self._store.execute("CREATE TABLE IF NOT EXISTS solved (key BLOB PRIMARY KEY, result INTEGER, turns INTEGER)")
+            else:
+                self._store = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        self._max_actions = max_actions
+        self._node_limit = node_limit
+        self._nodes = 0
+
+    def _lookup(self, key):
+        if key in self._memo:
+            return self._memo[key]
+        if self._store is not None:
+            row = self._store.execute("SELECT result, turns FROM solved WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                result = (row[0], row[1])
+                self._remember(key, result)
+                return result
+        return None
+
+    def _remember(self, key, result):
+        if len(self._memo) >= self._memo_limit:
+            self._memo.clear()
+        self._memo[key] = result
+
+    def _save(self, key, result):
+        self._remember(key, result)
+        if self._store is not None and self._writable:
+            self._store.execute("INSERT OR REPLACE INTO solved VALUES (?, ?, ?)", (key, result[0], result[1]))
+
+    def probe(self, board, side):
+        """
+        Returns the stored (result, turns to the end) for a position, or None
+        """
+        return self._lookup(position_key(board, side))
+
+    def solve(self, board, side):
+        """
+        Solves a position, returning (result, turns to the end) or None if it is too big
+        """
+        key = position_key(board, side)
+        result = self._lookup(key)
+        if result is not None:
+            return result
+        if key in self._failed:
+            return None
+        if any(board.get_worker_height(w) == 3 for w in SIDES[1 - side]):
+            return (LOSS, 0)
+        self._nodes = 0
+        try:
+            return self._solve(board, side)
+        except _Unsolved:
+            self._failed.add(key)
+            return None
+
+    def _solve(self, board, side):
+        key = position_key(board, side)
+        result = self._lookup(key)
+        if result is not None:
+            return result
+        self._nodes += 1
+        if self._nodes > self._node_limit:
+            raise _Unsolved()
+        actions = board.action_list(SIDES[side])
+        result = (LOSS, 0)
+        for action in actions:
+            if board.move_height(action[0], action[1]) == 3:
+                result = (WIN, 1)
+                break
+        else:
+            for action in actions:
+                undo_token = board.make_move(action)
+                try:
+                    child = self._solve(board, 1 - side)
+                finally:
+                    board.unmake_move(undo_token)
+                if child[0] == LOSS:
+                    # keep looking: a later turn may win sooner
+                    if result[0] == LOSS or child[1] + 1 < result[1]:
+                        result = (WIN, child[1] + 1)
+                elif result[0] == LOSS:
+                    result = (LOSS, max(result[1], child[1] + 1))
+        self._save(key, result)
+        return result
+
+    def best_action(self, board, side):
+        """
+        Returns the best full turn for a position small enough to solve: the quickest win found,
+        or the longest resistance when every turn loses. Returns None for other positions.
+        """
+        actions = board.action_list(SIDES[side])
+        if not actions or len(actions) > self._max_actions:
+            return None
+        if self.solve(board, side) is None:
+            return None
+        best_action = None
+        best_score = None
+        for action in actions:
+            if board.move_height(action[0], action[1]) == 3:
+                return action
+            undo_token = board.make_move(action)
+            child = self.probe(board, 1 - side)
+            board.unmake_move(undo_token)
+            if child is None:
+                continue
+            # prefer short wins, then long losses
+            score = -child[0] * 1000 + (child[1] if child[0] == WIN else -child[1])
+            if best_score is None or score > best_score:
+                best_action = action
+                best_score = score
+        return best_action
+
+    def __len__(self):
+        return len(self._memo)
+
+    def close(self):
+        if self._store is not None:
+            if self._writable:
+                self._store.commit()
+            self._store.close()
+            self._store = None
+
+_shared = None
+
+def get_tablebase():
+    """
+    Returns the tablebase shared by the AI players of this process. It reads solved positions
+    from the store named by the SANTORINI_TABLEBASE environment variable, if set, and keeps
+    new results in memory so concurrent processes never write to the store.
+    """
+    global _shared
+    if _shared is None:
+        _shared = Tablebase(os.environ.get('SANTORINI_TABLEBASE'), writable=False)
+    return _shared
+
+def main(argv=None):
+    from record import read_games
+    parser = argparse.ArgumentParser(description="Solves the late-game positions of recorded games into a tablebase store")
+    parser.add_argument('store')
+    parser.add_argument('records', nargs='+', help="game record files")
+    parser.add_argument('--max-actions', type=int, default=16)
+    parser.add_argument('--node-limit', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    tablebase = Tablebase(args.store, max_actions=args.max_actions, node_limit=args.node_limit)
+    solved = 0
+    try:
+        for path in args.records:
+            for game in read_games(path):
+                for turn, (board, action) in enumerate(game.replay(), 1):
+                    side = turn % 2
+                    if len(board.action_list(SIDES[side])) <= args.max_actions and tablebase.solve(board, side) is not None:
+                        solved += 1
+    finally:
+        tablebase.close()
+    print(f"{solved} positions solved, {len(tablebase)} results stored")
+
+if __name__ == "__main__":
+    main()
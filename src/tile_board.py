@@ -0,0 +1,79 @@
+from tile import SantoriniTile
+
+DIRECTIONS = {"n": (-1, 0), "ne": (-1, 1), "e": (0, 1), "se": (1, 1),
+              "s": (1, 0), "sw": (1, -1), "w": (0, -1), "nw": (-1, -1)}
+
+class TileGridBoard():
+    """
+    Reference implementation of the tile-grid board SantoriniBoard replaced: a grid of tiles,
+    workers pointing at tiles, and every rule worked out from row and column arithmetic. It is
+    built from a SantoriniBoard's position and is kept only to check and time the packed board
+    against. The scores follow the spec for the standard 5x5 game.
+    """
+    def __init__(self, board):
+        self._rows, self._cols = board.rows, board.cols
+        self._sides = board.sides
+        self._grid = [[SantoriniTile(r, c) for c in range(self._cols)] for r in range(self._rows)]
+        for tile, height in zip((tile for row in self._grid for tile in row), board.get_heights()):
+            tile.height = height
+        self._worker = {w: self._grid[square // self._cols][square % self._cols]
+                        for w, square in board.get_worker_squares().items()}
+
+    def _target(self, w, direction):
+        row = self._worker[w].row + DIRECTIONS[direction][0]
+        col = self._worker[w].col + DIRECTIONS[direction][1]
+        if row < 0 or row >= self._rows or col < 0 or col >= self._cols:
+            return None
+        return self._grid[row][col]
+
+    def _is_occupied(self, tile):
+        for w in self._worker:
+            if self._worker[w] == tile:
+                return True
+        return False
+
+    def valid_build(self, w, direction):
+        tile = self._target(w, direction)
+        return tile is not None and not self._is_occupied(tile) and tile.height != 4
+
+    def valid_move(self, w, direction):
+        return self.valid_build(w, direction) and self._target(w, direction).height - self._worker[w].height <= 1
+
+    def move_list(self, w):
+        return [direction for direction in DIRECTIONS if self.valid_move(w, direction)]
+
+    def build_list(self, w):
+        return [direction for direction in DIRECTIONS if self.valid_build(w, direction)]
+
+    def is_possible_next_turn(self, w):
+        return len(self.move_list(w)) > 0
+
+    def move(self, w, direction):
+        self._worker[w] = self._target(w, direction)
+
+    def build(self, w, direction):
+        self._target(w, direction).height += 1
+
+    def get_worker_height(self, w):
+        return self._worker[w].height
+
+    def height_score(self, workers):
+        return sum(self._worker[w].height for w in workers)
+
+    def center_score(self, workers):
+        score = 0
+        for w in workers:
+            row, col = self._worker[w].row, self._worker[w].col
+            if row == 2 and col == 2:
+                score += 2
+            elif 1 <= row <= 3 and 1 <= col <= 3:
+                score += 1
+        return score
+
+    def distance_score(self, workers):
+        opponents = self._sides[1] if workers == self._sides[0] else self._sides[0]
+        total = 0
+        for o in opponents:
+            total += min(max(abs(self._worker[w].row - self._worker[o].row),
+                             abs(self._worker[w].col - self._worker[o].col)) for w in workers)
+        return 8 - total
@@ -0,0 +1,126 @@
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from simulate import AI_PLAYER_TYPES, game_seed, play_headless
+
+def schedule(player_types, games, pairings=None):
+    """
+    Lists (white, blue, game index) for every game. Without fixed pairings every ordered pair of
+    different player types meets, so each type plays both colours against each opponent.
+    """
+    if pairings is None:
+        pairings = list(itertools.permutations(player_types, 2))
+    return [(p1, p2, index) for p1, p2 in pairings for index in range(games)]
+
+def chunks(games, size):
+    """
+    Splits the schedule into chunks of at most size games
+    """
+    return [games[i:i + size] for i in range(0, len(games), size)]
+
+def play_chunk(args):
+    """
+    Runs one chunk in a worker process. Every game is seeded from the tournament seed, the
+    pairing and the game index, so results do not depend on how games are split or scheduled.
+    """
+    seed, chunk = args
+    results = []
+    for p1, p2, index in chunk:
+        winner, length = play_headless(p1, p2, game_seed(f"{seed}:{p1}:{p2}", index))
+        results.append((p1, p2, winner, length))
+    return results
+
+def wilson_interval(wins, games, z=1.96):
+    """
+    Returns the Wilson score confidence interval (95% by default) for a win rate
+    """
+    if games == 0:
+        return 0.0, 0.0
+    rate = wins / games
+    denominator = 1 + z * z / games
+    centre = (rate + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+class TournamentTable():
+    """
+    Accumulates game results per (white, blue) pairing
+    """
+    def __init__(self):
+        self._results = {}
+
+    def add(self, p1, p2, winner, length):
+        """
+        Adds one game. A winner of None counts as a draw.
+        """
+        row = self._results.setdefault((p1, p2), [0, 0, 0, 0])
+        if winner is None:
+            row[2] += 1
+        else:
+            row[winner] += 1
+        row[3] += length
+
+    def merge(self, results):
+        for result in results:
+            self.add(*result)
+
+    def games(self):
+        return sum(row[0] + row[1] + row[2] for row in self._results.values())
+
+    def rows(self):
+        """
+        Yields (white, blue, games, white wins, blue wins, draws, average length, white win interval)
+        """
+        for (p1, p2), (white, blue, draws, length) in sorted(self._results.items()):
+            games = white + blue + draws
+            yield p1, p2, games, white, blue, draws, length / games, wilson_interval(white, games)
+
+    def __str__(self):
+        lines = [f"{'white':>10} {'blue':>10} {'games':>7} {'white %':>8} {'95% CI':>15} {'blue %':>7} {'draw %':>7} {'length':>7}"]
+        for p1, p2, games, white, blue, draws, length, (low, high) in self.rows():
+            lines.append(f"{p1:>10} {p2:>10} {games:>7} {white / games:>8.1%} {f'{low:.1%}-{high:.1%}':>15} "
+                         f"{blue / games:>7.1%} {draws / games:>7.1%} {length:>7.2f}")
+        return "\n".join(lines)
+
+def run_tournament(player_types, games, seed=0, processes=None, chunk_size=50, pairings=None, progress=None):
+    """
+    Plays the schedule on a process pool and merges results as chunks finish. Calls
+    progress(table) after every chunk if given. Returns the table and the elapsed seconds.
+    """
+    work = [(seed, chunk) for chunk in chunks(schedule(player_types, games, pairings), chunk_size)]
+    table = TournamentTable()
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        for results in pool.imap_unordered(play_chunk, work):
+            table.merge(results)
+            if progress is not None:
+                progress(table)
+    return table, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plays a round-robin tournament between AI player types on a process pool")
+    parser.add_argument('players', nargs='*', metavar='PLAYER',
+                        help=f"player types taking part, from {', '.join(AI_PLAYER_TYPES)} (round-robin, both colours; default heuristic and random)")
+    parser.add_argument('--games', type=int, default=1000, help="games per ordered pairing")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=50)
+    args = parser.parse_args(argv)
+    players = args.players or ['heuristic', 'random']
+    for player in players:
+        if player not in AI_PLAYER_TYPES:
+            parser.error(f"invalid player type: {player}")
+
+    def progress(table):
+        print(f"\r{table.games()} games played", end="", flush=True)
+
+    table, elapsed = run_tournament(players, args.games, args.seed, args.processes, args.chunk_size, progress=progress)
+    print()
+    print(table)
+    print(f"{table.games() / elapsed:.1f} games/s on {args.processes} processes ({elapsed:.2f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from collections import namedtuple
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+TableEntry = namedtuple('TableEntry', ['key', 'depth', 'flag', 'score', 'best_move', 'generation'])
+
+class TranspositionTable():
+    """
+    Fixed-size hash table of search results keyed by Zobrist key. Each slot keeps one entry;
+    a new result replaces the stored one when it is for the same position, when it was searched
+    at least as deep, or when the stored entry is left over from an earlier search.
+    """
+    def __init__(self, size=1 << 16):
+        if size <= 0 or size & (size - 1):
+            raise ValueError("Table size must be a power of two")
+        self._mask = size - 1
+        self._slots = [None] * size
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+        self._stores = 0
+
+    def new_search(self):
+        """
+        Marks the start of a new search so older entries become the first to be replaced
+        """
+        self._generation += 1
+
+    def probe(self, key):
+        """
+        Returns the entry stored for a key, or None
+        """
+        entry = self._slots[key & self._mask]
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry.key != key:
+            self._misses += 1
+            self._collisions += 1
+            return None
+        self._hits += 1
+        return entry
+
+    def store(self, key, depth, flag, score, best_move):
+        """
+        Stores a search result, subject to the replacement policy
+        """
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is None or entry.key == key or depth >= entry.depth or entry.generation != self._generation:
+            self._slots[index] = TableEntry(key, depth, flag, score, best_move, self._generation)
+            self._stores += 1
+
+    def clear(self):
+        """
+        Empties the table and resets the statistics
+        """
+        self._slots = [None] * len(self._slots)
+        self._hits = self._misses = self._collisions = self._stores = 0
+
+    def stats(self):
+        """
+        Returns the hit, miss, collision and store counts along with the number of filled slots
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'collisions': self._collisions,
+            'stores': self._stores,
+            'filled': sum(1 for entry in self._slots if entry is not None),
+        }
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __str__(self):
+        stats = self.stats()
+        probes = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / probes if probes else 0.0
+        return (f"hits {stats['hits']}, misses {stats['misses']}, collisions {stats['collisions']}, "
+                f"hit rate {hit_rate:.1%}, filled {stats['filled']}/{len(self)}")
@@ -0,0 +1,48 @@
+import random
+import pytest
+from board import SantoriniBoard
+from tile_board import DIRECTIONS, TileGridBoard
+
+SIDES = (['A', 'B'], ['Y', 'Z'])
+
+def assert_same(reference, board):
+    for w in 'ABYZ':
+        assert board.move_list(w) == reference.move_list(w)
+        assert board.build_list(w) == reference.build_list(w)
+        assert board.is_possible_next_turn(w) == reference.is_possible_next_turn(w)
+        assert board.get_worker_height(w) == reference.get_worker_height(w)
+        for direction in DIRECTIONS:
+            assert board.valid_move(w, direction) == reference.valid_move(w, direction)
+            assert board.valid_build(w, direction) == reference.valid_build(w, direction)
+    for workers in SIDES:
+        expected = (reference.height_score(workers), reference.center_score(workers), reference.distance_score(workers))
+        assert (board.height_score(workers), board.center_score(workers), board.distance_score(workers)) == expected
+        assert board.evaluate(workers) == expected
+
+def test_opening_layout():
+    # the original board put A at row 3 col 1, B at 1,3, Y at 1,1 and Z at 3,3
+    board = SantoriniBoard()
+    assert board.get_worker_squares() == {'A': 16, 'B': 8, 'Y': 6, 'Z': 18}
+    assert board.get_heights() == [0] * 25
+
+@pytest.mark.parametrize('seed', range(40))
+def test_random_games_match_reference(seed):
+    rng = random.Random(seed)
+    board = SantoriniBoard()
+    reference = TileGridBoard(board)
+    side = 0
+    while True:
+        assert_same(reference, board)
+        if any(reference.get_worker_height(w) == 3 for w in 'ABYZ'):
+            break
+        workers = [w for w in SIDES[side] if reference.is_possible_next_turn(w)]
+        if not workers:
+            break
+        w = rng.choice(workers)
+        direction = rng.choice(reference.move_list(w))
+        reference.move(w, direction)
+        board.move(w, direction)
+        direction = rng.choice(reference.build_list(w))
+        reference.build(w, direction)
+        board.build(w, direction)
+        side = 1 - side
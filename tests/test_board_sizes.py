@@ -0,0 +1,22 @@
+import random
+import pytest
+from board import SantoriniBoard
+from player import RandomPlayer
+from simulate import game_seed, play_headless
+
+@pytest.mark.parametrize('workers_per_side', [1, 3])
+@pytest.mark.parametrize('white, blue', [('random', 'random'), ('heuristic', 'random'), ('random', 'heuristic')])
+def test_games_finish_on_larger_boards(white, blue, workers_per_side):
+    for index in range(20):
+        winner, length = play_headless(white, blue, game_seed(0, index), size=7, workers_per_side=workers_per_side)
+        assert winner in (0, 1)
+        assert length > 0
+
+def test_random_player_selects_the_only_movable_worker():
+    # A and B stand in corners walled in by domes; only C can move
+    heights = [0] * 81
+    for square in (1, 9, 10, 7, 16, 17):
+        heights[square] = 4
+    board = SantoriniBoard(9, 9, 3, (heights, {'A': 0, 'B': 8, 'C': 40, 'X': 72, 'Y': 76, 'Z': 80}))
+    player = RandomPlayer(0, board, random.Random(0))
+    assert {player.select_worker() for _ in range(20)} == {'C'}
@@ -0,0 +1,22 @@
+from notation import parse_position
+from player import MinimaxPlayer
+
+# With eight shares, several prove at depth 2 that all their turns lose, while the shares
+# holding the best turns need depth 3 to tell them apart
+POSITION = "13100/11100/22120/13201/00112 20,12,10,23 w"
+
+def searched_score(board, side, action, depth):
+    player = MinimaxPlayer(side, board, time_limit=float('inf'), max_depth=depth, processes=1)
+    return player._deepen([action])[-1][1]
+
+def test_parallel_choice_matches_single_process_search():
+    board, side = parse_position(POSITION)
+    depth = 3
+    single = MinimaxPlayer(side, board, time_limit=float('inf'), max_depth=depth, processes=1)
+    _, best_score, _ = single.search_scores()[-1]
+    parallel = MinimaxPlayer(side, board, time_limit=float('inf'), max_depth=depth, processes=8)
+    try:
+        action = parallel.search()
+    finally:
+        parallel.close()
+    assert searched_score(board, side, action, depth) == best_score
@@ -0,0 +1,6 @@
+from board import SantoriniBoard
+from perft import KNOWN_NODE_COUNTS, run
+
+def test_known_node_counts():
+    counts, _ = run(SantoriniBoard(), 0, 3)
+    assert counts == [KNOWN_NODE_COUNTS[depth] for depth in (1, 2, 3)]
@@ -0,0 +1,85 @@
+import asyncio
+import random
+from concurrent.futures import ProcessPoolExecutor
+from server import start_server
+
+DIRECTIONS = ['n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw']
+
+async def read_line(reader):
+    line = await asyncio.wait_for(reader.readline(), 60)
+    assert line, "server closed the connection"
+    return line.decode().rstrip("\n")
+
+async def send(writer, text):
+    writer.write((text + "\n").encode())
+    await writer.drain()
+
+async def ai_session(port, white, blue):
+    """
+    Plays one AI-vs-AI game and returns every line the server sent
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    assert (await read_line(reader)).startswith("new ")
+    await send(writer, f"new {white} {blue}")
+    lines = []
+    while True:
+        line = await read_line(reader)
+        if line.startswith("new "):
+            break
+        lines.append(line)
+    await send(writer, "quit")
+    writer.close()
+    return lines
+
+async def human_session(port, seed):
+    """
+    Plays a human-vs-random game with undo on, answering every prompt with a random choice
+    that is sometimes invalid, then asks for the stats. Returns (lines, stats line).
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await read_line(reader)
+    await send(writer, "new human random on off")
+    lines = []
+    while True:
+        line = await read_line(reader)
+        lines.append(line)
+        if line.startswith("undo, redo"):
+            await send(writer, rng.choice(['next', 'next', 'next', 'undo', 'redo']))
+        elif line.startswith("Select a worker"):
+            await send(writer, rng.choice(['A', 'B', 'Y', 'Q']))
+        elif line.startswith("Select a direction"):
+            await send(writer, rng.choice(DIRECTIONS + ['x']))
+        elif line.endswith("has won"):
+            break
+    await read_line(reader)
+    await send(writer, "stats")
+    stats = await read_line(reader)
+    await read_line(reader)
+    await send(writer, "quit")
+    writer.close()
+    return lines, stats
+
+async def play_sessions():
+    with ProcessPoolExecutor(2) as executor:
+        server, metrics = await start_server(port=0, executor=executor)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            results = await asyncio.gather(*[ai_session(port, 'heuristic', 'random') for _ in range(4)],
+                                           ai_session(port, 'random', 'heuristic'),
+                                           human_session(port, 0))
+        finally:
+            server.close()
+            await server.wait_closed()
+    return results, metrics
+
+def test_concurrent_sessions():
+    results, metrics = asyncio.run(play_sessions())
+    for lines in results[:-1]:
+        assert sum(line.endswith("has won") for line in lines) == 1
+        assert any(line.startswith("Turn: 1, white (AB)") for line in lines)
+    lines, stats = results[-1]
+    assert "That is not your worker" in lines or "Not a valid worker" in lines
+    assert stats.startswith("sessions: ")
+    assert metrics.games == 6
+    assert metrics.turns > 0
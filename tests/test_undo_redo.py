@@ -0,0 +1,32 @@
+import copy
+import random
+import pytest
+from game import Game
+
+def state(board, turn_num):
+    return board.get_heights(), board.get_worker_squares(), board.zobrist_key, turn_num
+
+@pytest.mark.parametrize('seed', range(20))
+def test_mixed_undo_redo_matches_snapshots(seed):
+    rng = random.Random(seed)
+    game = Game('random', 'random', True, False, seed=seed, verbose=False)
+    # the reference history keeps a full copy of the board after every turn
+    history = [(copy.deepcopy(game.board), game.turn_num)]
+    current = 0
+    for step in range(300):
+        choice = rng.random()
+        if choice < 0.2:
+            game.undo()
+            current = max(current - 1, 0)
+        elif choice < 0.35:
+            game.redo()
+            current = min(current + 1, len(history) - 1)
+        elif game.winner() is not None:
+            game.undo()
+            current = max(current - 1, 0)
+        else:
+            game.play_turn(*game.choose_turn())
+            del history[current + 1:]
+            history.append((copy.deepcopy(game.board), game.turn_num))
+            current += 1
+        assert state(game.board, game.turn_num) == state(*history[current]), step